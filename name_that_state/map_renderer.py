@@ -0,0 +1,117 @@
+## Map renderers for the Name that State quiz
+## Both draw the state highlights over the U.S. map on a tk.Canvas and offer the
+## same three calls: highlight(state, color), clear(state) and reset().
+##   PolygonLayerRenderer   canvas polygons over a static map (the default)
+##   DirtyRegionRenderer    highlights painted into the map bitmap, re-uploading
+##                          only the bounding box of the state that changed
+## Renderers are created as renderer_class(canvas, map_image, state_masks).
+
+
+import tkinter as tk
+
+#pip install pillow
+from PIL import ImageTk
+
+from state_boundaries import state_boundaries
+
+
+class PolygonLayerRenderer:
+    """Shows the map once as a static image and lays one canvas polygon per state
+    over it. Highlighting is an itemconfig on that polygon, so no image is ever
+    redrawn or sent to Tk again."""
+
+    def __init__(self, canvas, map_image, state_masks=None):
+        # Canvas polygons are drawn by Tk itself, so state_masks isn't needed here
+        self.canvas = canvas
+
+        # The base map is converted to a tkinter image exactly once
+        self.map_photo = ImageTk.PhotoImage(map_image)
+        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.map_photo)
+
+        # One hidden polygon per state, stacked above the map (state name -> canvas item id)
+        self.polygons = {}
+        for state, boundary in state_boundaries.items():
+            # create_polygon wants a flat list of x, y values
+            coordinates = [value for point in boundary for value in point]
+            self.polygons[state] = self.canvas.create_polygon(
+                coordinates, outline="black", fill="", state=tk.HIDDEN)
+
+    def highlight(self, state, color):
+        """Fill the given state with the specified color."""
+        if state in self.polygons:
+            self.canvas.itemconfig(self.polygons[state], fill=color, state=tk.NORMAL)
+
+    def clear(self, state):
+        """Remove the highlight from one state."""
+        if state in self.polygons:
+            self.canvas.itemconfig(self.polygons[state], fill="", state=tk.HIDDEN)
+
+    def reset(self):
+        """Hide every highlight, leaving the plain map."""
+        for polygon in self.polygons.values():
+            self.canvas.itemconfig(polygon, fill="", state=tk.HIDDEN)
+
+
+class DirtyRegionRenderer:
+    """Paints the highlights into the map bitmap, like the original highlight_state,
+    but only sends Tk the bounding box of the state that changed, so the cost of a
+    highlight follows the size of the state instead of the size of the map. The
+    states are painted from the pre-rasterized masks in state_masks."""
+
+    def __init__(self, canvas, map_image, state_masks):
+        self.canvas = canvas
+        self.state_masks = state_masks
+
+        # The clean map, used to undo highlights, and the copy the highlights are painted on
+        self.original_map_image = map_image.copy()
+        self.map_image = map_image.copy()
+
+        # The full map is converted to a tkinter image only this once
+        self.map_photo = ImageTk.PhotoImage(self.map_image)
+        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.map_photo)
+
+        # States painted since the last reset and their colors (state -> color)
+        self.dirty_states = {}
+
+    def highlight(self, state, color):
+        """Fill the given state with the specified color."""
+        if state in state_boundaries:
+            self.state_masks.paint(self.map_image, state, color)
+            self.dirty_states[state] = color
+            self.refresh(self.state_masks.box(state))
+
+    def clear(self, state):
+        """Remove the highlight from one state."""
+        if self.dirty_states.pop(state, None) is None:
+            return
+        box = self.state_masks.box(state)
+        left, top = box[:2]
+        tile = self.original_map_image.crop(box)
+
+        # The clean box would also wipe any neighbor painted inside it, so paint those
+        # again, into the tile only so nothing outside the box is touched
+        for other, color in self.dirty_states.items():
+            other_left, other_top, other_right, other_bottom = self.state_masks.box(other)
+            if (other_left < box[2] and left < other_right
+                    and other_top < box[3] and top < other_bottom):
+                self.state_masks.paint(tile, other, color, origin=(left, top))
+        self.map_image.paste(tile, (left, top))
+        self.refresh(box)
+
+    def reset(self):
+        """Put back the clean map, one painted bounding box at a time."""
+        for state in self.dirty_states:
+            box = self.state_masks.box(state)
+            self.map_image.paste(self.original_map_image.crop(box), box[:2])
+            self.refresh(box)
+        self.dirty_states.clear()
+
+    def refresh(self, box):
+        """Copy one region of the painted bitmap into the displayed image."""
+        # Only the pixels inside the box are converted to a tkinter image
+        tile = ImageTk.PhotoImage(self.map_image.crop(box))
+
+        # Tk copies the tile into place; "set" replaces the pixels instead of blending
+        # the tile's transparent areas over whatever highlight was there before
+        self.canvas.tk.call(str(self.map_photo), "copy", str(tile),
+                            "-to", box[0], box[1], "-compositingrule", "set")
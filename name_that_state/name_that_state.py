@@ -5,40 +5,53 @@
 ## GitHub  : https://github.com/softwareNuggets/Python_Shorts/tree/main/CreateImageMapCoordinates
 
 
+import argparse
 import tkinter as tk
 from tkinter import messagebox, font
 
 #pip install pillow
-from PIL import Image, ImageTk, ImageDraw
+from PIL import Image
 
 import random
 from usa_states import *
-from state_boundaries import state_boundaries
+from map_renderer import DirtyRegionRenderer, PolygonLayerRenderer
+from state_masks import StateMasks
+from question_generator import QuestionGenerator, build_adjacency
+
+# The map, with its state mask atlas cached next to it
+MAP_IMAGE_PATH = "usa_v1.png"
+
+# Fill color for the state under the mouse in "click the state" mode
+HOVER_COLOR = "lightblue"
 
 
 
 class StateQuizApp:
-    def __init__(self, root):
+    def __init__(self, root, renderer_class=PolygonLayerRenderer, neighbor_share=0.0):
         self.root = root
         self.root.title("Name that State")
 
         # Load the U.S. map image
         try:
-            self.original_map_image = Image.open("usa_v1.png")
-            self.map_image = self.original_map_image.copy()
+            self.map_image = Image.open(MAP_IMAGE_PATH)
         except FileNotFoundError:
             messagebox.showerror("Error", "Map image not found!")
             self.root.quit()
             return
 
-        # Converts self.map_image to a tkinter-compatible format and stores it in 'self.map_photo'.
-        self.map_photo = ImageTk.PhotoImage(self.map_image)
-
         # Creates a canvas with the map’s dimensions to display the map in the window.
         self.canvas = tk.Canvas(root, width=self.map_image.width, height=self.map_image.height)
         self.canvas.pack()
-        # Draws the map on the canvas at position (0,0), anchored at the top-left corner.
-        self.map_image_on_canvas = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.map_photo)
+        # Pre-rasterized state masks, read from disk (or built) the first time they are used.
+        self.state_masks = StateMasks(MAP_IMAGE_PATH)
+
+        # Draws the map on the canvas; the renderer takes care of the state highlights.
+        self.renderer = renderer_class(self.canvas, self.map_image, self.state_masks)
+
+        # Find the state under the mouse for "click the state" mode.
+        self.canvas.bind("<Motion>", self.on_map_hover)
+        self.canvas.bind("<Leave>", self.on_map_leave)
+        self.canvas.bind("<Button-1>", self.on_map_click)
 
         # Creates a frame to hold the answer buttons in the GUI.
         self.button_frame = tk.Frame(root)
@@ -53,6 +66,16 @@ class StateQuizApp:
         self.buttons = []
         self.randomized_list = []
         
+        # Picks the wrong answers; neighbor_share is the chance that each one is a
+        # state bordering the correct answer, which makes the question harder
+        self.question_generator = QuestionGenerator(usa_states, build_adjacency(), neighbor_share)
+        
+        # "Click the state" mode: answer by clicking the map instead of a button
+        self.click_mode = tk.BooleanVar(value=False)
+        # The state currently under the mouse, and the colors of the states already answered
+        self.hover_state = None
+        self.state_colors = {}
+        
         # Add a score display
         self.score = 0
         self.total_questions = 0
@@ -62,9 +85,14 @@ class StateQuizApp:
         # Initialize the game
         self.reset_game()
         
-        # Add a reset button
-        self.reset_button = tk.Button(root, text="Reset Game", command=self.reset_game, font=self.button_font)
-        self.reset_button.pack(pady=5)
+        # Add a reset button, with the answer mode switch next to it
+        control_frame = tk.Frame(root)
+        control_frame.pack(pady=5)
+        self.reset_button = tk.Button(control_frame, text="Reset Game", command=self.reset_game, font=self.button_font)
+        self.reset_button.pack(side=tk.LEFT, padx=5)
+        self.click_mode_check = tk.Checkbutton(control_frame, text="Click the state", variable=self.click_mode,
+                                               command=self.reset_game, font=self.button_font)
+        self.click_mode_check.pack(side=tk.LEFT, padx=5)
     
     def randomize_states(self):
         # Create a copy to avoid modifying the original list
@@ -74,10 +102,10 @@ class StateQuizApp:
         self.number_of_states = len(self.randomized_list)
         
     def reset_game(self):
-        # Reset the map image
-        self.map_image = self.original_map_image.copy()
-        self.map_photo = ImageTk.PhotoImage(self.map_image)
-        self.canvas.itemconfig(self.map_image_on_canvas, image=self.map_photo)
+        # Clear the highlights from the map
+        self.renderer.reset()
+        self.hover_state = None
+        self.state_colors.clear()
         
         # Reset game variables
         self.randomized_list = []
@@ -111,6 +139,11 @@ class StateQuizApp:
         self.current_state = self.randomized_list[self.current_state_index]
         self.current_state_index += 1
         
+        if self.click_mode.get():
+            # Ask for the state by name; the player finds it on the map
+            self.show_click_prompt()
+            return
+
         # Highlight the selected state's boundary
         self.highlight_state(self.current_state, "yellow")
         
@@ -119,23 +152,57 @@ class StateQuizApp:
 
     def highlight_state(self, state, color):
         """Highlight the boundary of the given state with the specified color."""
-        if state in state_boundaries:
+        # Remember the color so a hover highlight passing over the state can put it back.
+        self.state_colors[state] = color
+        # Only the state's own highlight changes; the rest of the map is never redrawn.
+        self.renderer.highlight(state, color)
 
-            # Retrieves the boundary coordinates for the state from 'state_boundaries'.
-            boundary = state_boundaries[state]
+    def show_click_prompt(self):
+        """Replace the answer buttons with the name of the state to click."""
+        for button in self.buttons:
+            button.destroy()
+        self.buttons.clear()
 
-            # Creates a drawing object to draw on 'self.map_image'.
-            draw = ImageDraw.Draw(self.map_image)
-            
-            # Draws a polygon using the boundary coordinates, with a black outline and the
-            # specified color fill.
-            draw.polygon(boundary, outline="black", fill=color)
+        prompt = tk.Label(self.button_frame, text=f"Click on {self.current_state}", font=self.button_font)
+        prompt.pack(side=tk.LEFT, padx=5)
+        self.buttons.append(prompt)
+
+    def set_hover_state(self, state):
+        """Move the hover highlight to the given state (None removes it)."""
+        if state == self.hover_state:
+            return  # Still over the same state, nothing to redraw
+
+        # Put the previous state back the way it was before the mouse arrived
+        previous = self.hover_state
+        if previous is not None:
+            if previous in self.state_colors:
+                self.renderer.highlight(previous, self.state_colors[previous])
+            else:
+                self.renderer.clear(previous)
+
+        self.hover_state = state
+        if state is not None:
+            self.renderer.highlight(state, HOVER_COLOR)
 
-            # Updates 'self.map_photo' with the modified map image in a tkinter-compatible format.
-            self.map_photo = ImageTk.PhotoImage(self.map_image)
+    def on_map_hover(self, event):
+        """Highlight the state under the mouse in "click the state" mode."""
+        if self.click_mode.get():
+            # One byte lookup in the label map, whatever the mouse-event rate
+            self.set_hover_state(self.state_masks.state_at(event.x, event.y))
 
-            # Updates the canvas to display the modified map with the highlighted state.
-            self.canvas.itemconfig(self.map_image_on_canvas, image=self.map_photo)
+    def on_map_leave(self, event):
+        self.set_hover_state(None)
+
+    def on_map_click(self, event):
+        """Answer with the state that was clicked in "click the state" mode."""
+        # Ignore clicks outside click mode and once the current state has been answered
+        if not self.click_mode.get() or self.current_state in self.state_colors:
+            return
+        clicked_state = self.state_masks.state_at(event.x, event.y)
+        if clicked_state is not None:
+            # Drop the hover highlight first so it doesn't cover the answer color
+            self.set_hover_state(None)
+            self.check_answer(clicked_state)
 
     def generate_buttons(self):
         """Generate 4 buttons: 3 random states and 1 correct state."""
@@ -144,14 +211,9 @@ class StateQuizApp:
             button.destroy()
         self.buttons.clear()
 
-        # Selects three random states from 'usa_states', excluding the correct state, for answer options.
-        random_states = random.sample([s for s in usa_states if s != self.current_state], 3)
-
-        # Combines the three random states and the correct state into a list of four options.
-        options = random_states + [self.current_state]
-
-        # Shuffles the options list to randomize the order of the answer buttons.
-        random.shuffle(options)  # Shuffle the options
+        # Picks three other states without copying 'usa_states', adds the correct state
+        # and shuffles the four options to randomize the order of the answer buttons.
+        options = self.question_generator.options(self.current_state)
 
         # Create buttons for each option
         for option in options:
@@ -187,7 +249,15 @@ class StateQuizApp:
 
 # Run the application
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Name that State")
+    parser.add_argument("--renderer", choices=["layers", "raster"], default="layers",
+                        help="canvas polygons over the map (default) or highlights painted into the map bitmap")
+    parser.add_argument("--neighbors", type=float, default=0.0, metavar="SHARE",
+                        help="chance (0-1) that each wrong answer is a state bordering the right one")
+    args = parser.parse_args()
+
     root = tk.Tk()
     root.geometry("900x700")
-    app = StateQuizApp(root)
+    app = StateQuizApp(root, DirtyRegionRenderer if args.renderer == "raster" else PolygonLayerRenderer,
+                       args.neighbors)
     root.mainloop()
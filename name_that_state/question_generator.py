@@ -0,0 +1,93 @@
+## Multiple-choice question generator for the Name that State quiz
+## Distractors are drawn from a pool of region indices by a partial Fisher-Yates
+## shuffle, so each question costs O(number of choices) no matter how many
+## regions there are (50 states or 3,000 counties). Optionally some distractors
+## are "confusable neighbors": regions that share a border with the answer,
+## taken from an adjacency table built once from the boundary polygons.
+
+
+import random
+
+from state_boundaries import state_boundaries
+
+# Vertices of two regions closer than this many pixels count as a shared border
+NEIGHBOR_TOLERANCE = 4
+
+
+def build_adjacency(boundaries=state_boundaries, tolerance=NEIGHBOR_TOLERANCE):
+    """Return {region: [neighboring regions]} for regions with a vertex within
+    tolerance pixels of each other. Vertices are hashed into tolerance-sized
+    cells, so only vertices in the same or an adjacent cell are compared."""
+    cells = {}
+    for region, boundary in boundaries.items():
+        for x, y in boundary:
+            cells.setdefault((x // tolerance, y // tolerance), []).append((x, y, region))
+
+    neighbors = {region: set() for region in boundaries}
+    for (column, row), vertices in cells.items():
+        for x, y, region in vertices:
+            for other_column in (column - 1, column, column + 1):
+                for other_row in (row - 1, row, row + 1):
+                    for other_x, other_y, other in cells.get((other_column, other_row), ()):
+                        if (other != region and abs(other_x - x) <= tolerance
+                                and abs(other_y - y) <= tolerance):
+                            neighbors[region].add(other)
+    return {region: sorted(others) for region, others in neighbors.items()}
+
+
+class QuestionGenerator:
+    """Builds the answer choices for a question.
+
+    regions is the list of possible answers. With an adjacency table, each
+    distractor is a neighbor of the answer with probability neighbor_share
+    (when an unused neighbor is left), and otherwise any other region.
+    """
+
+    def __init__(self, regions, adjacency=None, neighbor_share=0.0, rng=random):
+        self.regions = list(regions)
+        self.adjacency = adjacency or {}
+        self.neighbor_share = neighbor_share
+        self.rng = rng
+
+        # A permutation of the region indices that sampling shuffles in place,
+        # and where each index currently sits in it
+        self.pool = list(range(len(self.regions)))
+        self.positions = list(range(len(self.regions)))
+        self.index_of = {region: index for index, region in enumerate(self.regions)}
+
+    def swap(self, i, j):
+        """Swap two slots of the pool, keeping positions up to date."""
+        pool = self.pool
+        pool[i], pool[j] = pool[j], pool[i]
+        self.positions[pool[i]] = i
+        self.positions[pool[j]] = j
+
+    def distractors(self, answer, count=3):
+        """Return count distinct regions other than the answer."""
+        chosen = []
+
+        # Confusable neighbors first, one coin flip per distractor
+        neighbors = self.adjacency.get(answer, ())
+        if neighbors and self.neighbor_share > 0:
+            wanted = sum(self.rng.random() < self.neighbor_share for _ in range(count))
+            chosen = self.rng.sample(neighbors, min(wanted, len(neighbors)))
+
+        # Fill the rest uniformly: park the answer in the last slot of the pool,
+        # then shuffle just enough of the remaining slots to the front
+        last = len(self.pool) - 1
+        self.swap(self.positions[self.index_of[answer]], last)
+        slot = 0
+        while len(chosen) < count and slot < last:
+            self.swap(slot, self.rng.randrange(slot, last))
+            region = self.regions[self.pool[slot]]
+            # A region already taken as a neighbor just costs one more draw
+            if region not in chosen:
+                chosen.append(region)
+            slot += 1
+        return chosen
+
+    def options(self, answer, count=4):
+        """Return the answer and count - 1 distractors in random order."""
+        options = self.distractors(answer, count - 1) + [answer]
+        self.rng.shuffle(options)
+        return options
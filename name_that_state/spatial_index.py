@@ -0,0 +1,38 @@
+## Spatial index for finding the state under a point on the quiz map
+## A label raster holds one byte per map pixel: 0 where there is no state,
+## otherwise the position of the state in the index plus one. Finding the state
+## under a click or mouse move is then a single byte lookup, however many states
+## there are, so hover stays cheap at full mouse-event rates.
+
+
+#pip install pillow
+from PIL import Image
+
+
+class StateLabels:
+    """A label raster answering "which state is at (x, y)?" in constant time.
+
+    regions yields (state, box, mask) for each state in drawing order: the
+    state's (left, top, right, bottom) box on the map and a mode "1" or "L"
+    mask of its pixels inside that box. A later state wins the pixels it
+    shares with an earlier one. One byte per pixel allows up to 255 states.
+    """
+
+    def __init__(self, width, height, regions):
+        self.width = width
+        self.height = height
+
+        self.states = []
+        labels = Image.new("L", (width, height), 0)
+        for label, (state, box, mask) in enumerate(regions, start=1):
+            labels.paste(label, box, mask)
+            self.states.append(state)
+        self.labels = labels.tobytes()
+
+    def state_at(self, x, y):
+        """Return the state under the pixel (x, y), or None over water or background."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            label = self.labels[int(y) * self.width + int(x)]
+            if label:
+                return self.states[label - 1]
+        return None
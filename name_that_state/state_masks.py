@@ -0,0 +1,166 @@
+## Pre-rasterized state masks for the Name that State quiz
+## Every polygon in state_boundaries is drawn once into a small grayscale tile
+## (255 inside the state, 128 on its outline, 0 outside). The tiles are packed
+## into one atlas image and saved next to the map, e.g. usa_v1.masks.png, with
+## their positions stored in a PNG text chunk. The atlas is only built or read
+## the first time it's needed, and is rebuilt whenever state_boundaries or the
+## map image no longer match the fingerprint stored with it.
+
+
+import hashlib
+import json
+import os
+import sys
+
+#pip install pillow
+from PIL import Image, ImageDraw
+from PIL.PngImagePlugin import PngInfo
+
+from spatial_index import StateLabels
+from state_boundaries import state_boundaries
+
+# Bump when the atlas layout changes so old cache files get rebuilt
+ATLAS_VERSION = 1
+
+# Name of the PNG text chunk holding the atlas index
+ATLAS_KEY = "state_masks"
+
+# Tile values
+INSIDE = 255
+OUTLINE = 128
+
+
+def state_bounding_boxes(width, height, boundaries=state_boundaries):
+    """Return {state: (left, top, right, bottom)}, the pixel box each state's
+    boundary covers, clipped to a width x height map (right and bottom are
+    exclusive, as PIL's crop expects)."""
+    boxes = {}
+    for state, boundary in boundaries.items():
+        xs = [x for x, y in boundary]
+        ys = [y for x, y in boundary]
+        boxes[state] = (max(min(xs), 0), max(min(ys), 0),
+                        min(max(xs) + 1, width), min(max(ys) + 1, height))
+    return boxes
+
+
+def atlas_path(image_path):
+    """Where the mask atlas for a map image is cached"""
+    return os.path.splitext(image_path)[0] + ".masks.png"
+
+
+def source_fingerprint(image_path, boundaries=state_boundaries):
+    """Hash of everything the atlas is built from: the boundaries and the map image"""
+    digest = hashlib.sha256(f"{ATLAS_VERSION}:{sorted(boundaries.items())!r}".encode("utf-8"))
+    with open(image_path, "rb") as file:
+        digest.update(file.read())
+    return digest.hexdigest()
+
+
+class StateMasks:
+    """Per-state masks for painting highlights and a label map for finding the
+    state under a pixel, both read from the cached atlas on first use."""
+
+    def __init__(self, image_path, boundaries=state_boundaries):
+        self.image_path = image_path
+        self.cache_path = atlas_path(image_path)
+        self.boundaries = boundaries
+        self.loaded = False
+
+    def load(self):
+        """Read the atlas from disk, building and saving it first if it is
+        missing or out of date. Only the first call does any work."""
+        if self.loaded:
+            return self
+
+        with Image.open(self.image_path) as map_image:
+            self.width, self.height = map_image.size
+        fingerprint = source_fingerprint(self.image_path, self.boundaries)
+
+        atlas, index = None, None
+        try:
+            with Image.open(self.cache_path) as cached:
+                index = json.loads(cached.text[ATLAS_KEY])
+                if index["fingerprint"] == fingerprint:
+                    atlas = cached.convert("L")
+        except (OSError, KeyError, ValueError):
+            pass  # No usable cache, build a new one below
+
+        if atlas is None:
+            atlas, index = self.build(fingerprint)
+            try:
+                info = PngInfo()
+                info.add_text(ATLAS_KEY, json.dumps(index))
+                atlas.save(self.cache_path, pnginfo=info)
+            except OSError:
+                pass  # Read-only folder: keep using the atlas from memory
+
+        # Cut each state's tile back out of the atlas, split into an inside mask
+        # (outline included) and an outline mask, ready to use with Image.paste
+        self.boxes = {}
+        self.fill_masks = {}
+        self.outline_masks = {}
+        for state, (atlas_x, atlas_y, left, top, right, bottom) in index["states"].items():
+            tile = atlas.crop((atlas_x, atlas_y, atlas_x + right - left, atlas_y + bottom - top))
+            self.boxes[state] = (left, top, right, bottom)
+            self.fill_masks[state] = tile.point(lambda value: 255 if value else 0)
+            self.outline_masks[state] = tile.point(lambda value: 255 if value == OUTLINE else 0)
+
+        # The hit-test label raster is painted from the same masks
+        self.labels = StateLabels(self.width, self.height,
+                                  ((state, self.boxes[state], self.fill_masks[state])
+                                   for state in self.boxes))
+
+        self.loaded = True
+        return self
+
+    def build(self, fingerprint):
+        """Rasterize every state into a new atlas; returns (atlas, index)"""
+        boxes = state_bounding_boxes(self.width, self.height, self.boundaries)
+        tiles = {}
+        for state, (left, top, right, bottom) in boxes.items():
+            tile = Image.new("L", (right - left, bottom - top), 0)
+            shifted = [(x - left, y - top) for x, y in self.boundaries[state]]
+            ImageDraw.Draw(tile).polygon(shifted, fill=INSIDE, outline=OUTLINE)
+            tiles[state] = tile
+
+        # Pack the tiles in rows as wide as the map, tallest first
+        positions = {}
+        x = y = row_height = 0
+        for state in sorted(tiles, key=lambda state: -tiles[state].height):
+            tile = tiles[state]
+            if x + tile.width > self.width:
+                x, y, row_height = 0, y + row_height, 0
+            positions[state] = (x, y)
+            x += tile.width
+            row_height = max(row_height, tile.height)
+
+        atlas = Image.new("L", (self.width, y + row_height), 0)
+        index = {"fingerprint": fingerprint, "states": {}}
+        for state in boxes:  # state_boundaries order decides who wins shared pixels
+            atlas.paste(tiles[state], positions[state])
+            index["states"][state] = list(positions[state]) + list(boxes[state])
+        return atlas, index
+
+    def box(self, state):
+        """The (left, top, right, bottom) box of a state on the map"""
+        return self.load().boxes[state]
+
+    def state_at(self, x, y):
+        """Return the state under the pixel (x, y), or None: a single byte lookup."""
+        return self.load().labels.state_at(x, y)
+
+    def paint(self, image, state, color, origin=(0, 0)):
+        """Fill a state with color and outline it in black on image, whose top-left
+        corner is at origin on the map (so a crop of the map can be painted too)."""
+        self.load()
+        left, top, right, bottom = self.boxes[state]
+        box = (left - origin[0], top - origin[1], right - origin[0], bottom - origin[1])
+        image.paste(color, box, self.fill_masks[state])
+        image.paste("black", box, self.outline_masks[state])
+
+
+# Build (or refresh) the atlas ahead of time: python state_masks.py [map image]
+if __name__ == "__main__":
+    image_path = sys.argv[1] if len(sys.argv) > 1 else "usa_v1.png"
+    StateMasks(image_path).load()
+    print(f"State masks for {image_path} are up to date in {atlas_path(image_path)}")
@@ -0,0 +1,135 @@
+## Precomputed answer table for the WORD WRIGHT solver
+## For every 7-letter set that is the exact letter set of some word, the table
+## lists every word spelled from those letters. Words are not stored as text:
+## each match is a uint32 reference (length << 24 | index) into the sorted
+## length buckets of the Dictionary the table was built from, so a table costs
+## 4 bytes per match and is memory-mapped rather than read into Python objects.
+## Layout (little-endian):
+##   header   "WWANS001", uint32 set count, uint32 reference count,
+##            uint32 word count of the dictionary it was built from
+##   masks    per set: uint32 letter mask, in increasing order
+##   offsets  set count + 1 uint32s: set i owns references offsets[i]..offsets[i + 1]
+##   refs     the references, sorted by length then word index within each set
+
+from array import array
+from bisect import bisect_left
+import mmap
+import os
+import struct
+import sys
+
+ANSWER_TABLE_EXTENSION = ".answers.bin"
+ANSWER_TABLE_MAGIC = b"WWANS001"
+HEADER = struct.Struct("<8sIII")
+
+# Bits of a reference holding the word index; the length sits above them
+INDEX_BITS = 24
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+def answer_table_path(word_file_path):
+    """Default location of the precomputed answer table for a word file"""
+    return os.path.splitext(word_file_path)[0] + ANSWER_TABLE_EXTENSION
+
+
+def _little_endian(values):
+    """uint32 array in file byte order"""
+    values = array("I", values)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+class AnswerTable:
+    """Answers puzzles whose 7 letters are a known letter set with a binary search
+    instead of a scan"""
+
+    def __init__(self, masks, offsets, refs, word_count, mapping=None):
+        self.masks = masks
+        self.offsets = offsets
+        self.refs = refs
+        self.word_count = word_count
+        # The file mapping the arrays point into, for tables opened from disk
+        self.mapping = mapping
+
+    @classmethod
+    def build(cls, dictionary):
+        """Precompute the matches of every 7-letter set that is the exact letter
+        set of some word in the dictionary"""
+        refs_by_mask = {}
+        for length, bucket in dictionary.buckets.items():
+            for i, mask in enumerate(bucket.masks):
+                refs_by_mask.setdefault(mask, []).append(length << INDEX_BITS | i)
+
+        masks = array("I")
+        offsets = array("I", [0])
+        refs = array("I")
+        for letter_set in sorted(refs_by_mask):
+            if bin(letter_set).count("1") != 7:
+                continue
+            matches = []
+            # Walk every non-empty subset of the 7 letters (127 of them)
+            subset = letter_set
+            while subset:
+                matches.extend(refs_by_mask.get(subset, ()))
+                subset = (subset - 1) & letter_set
+            masks.append(letter_set)
+            refs.extend(sorted(matches))
+            offsets.append(len(refs))
+        return cls(masks, offsets, refs, len(dictionary))
+
+    def save(self, file_path):
+        """Write the table in the binary format"""
+        with open(file_path, "wb") as file:
+            file.write(HEADER.pack(ANSWER_TABLE_MAGIC, len(self.masks), len(self.refs),
+                                   self.word_count))
+            for values in (self.masks, self.offsets, self.refs):
+                file.write(_little_endian(values).tobytes())
+
+    @classmethod
+    def open(cls, file_path):
+        """Memory-map a table written by save"""
+        with open(file_path, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        magic, set_count, ref_count, word_count = HEADER.unpack_from(view, 0)
+        if magic != ANSWER_TABLE_MAGIC:
+            raise ValueError(f"{file_path} is not an answer table")
+
+        arrays = []
+        offset = HEADER.size
+        for count in (set_count, set_count + 1, ref_count):
+            values = view[offset:offset + 4 * count]
+            if sys.byteorder == "little":
+                values = values.cast("I")
+            else:
+                values = array("I", values)
+                values.byteswap()
+            arrays.append(values)
+            offset += 4 * count
+        return cls(*arrays, word_count, mapping)
+
+    def __len__(self):
+        return len(self.masks)
+
+    def lookup(self, dictionary, required, allowed, length):
+        """Return an iterator over the words of the given length that use only
+        the allowed letters and contain the required ones, or None when the
+        allowed letter set is not in the table"""
+        i = bisect_left(self.masks, allowed)
+        if i == len(self.masks) or self.masks[i] != allowed:
+            return None
+        bucket = dictionary.bucket(length)
+        if bucket is None:
+            return iter(())
+        # References are sorted, so this length's words are one run of them
+        start, end = self.offsets[i], self.offsets[i + 1]
+        first = bisect_left(self.refs, length << INDEX_BITS, start, end)
+        last = bisect_left(self.refs, (length + 1) << INDEX_BITS, first, end)
+        masks = bucket.masks
+        return (bucket.word(ref & INDEX_MASK) for ref in self.refs[first:last]
+                if masks[ref & INDEX_MASK] & required == required)
+
+    def nbytes(self):
+        """Size of the three arrays"""
+        return 4 * (len(self.masks) + len(self.offsets) + len(self.refs))
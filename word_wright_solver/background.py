@@ -0,0 +1,59 @@
+import queue
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker when its task has been cancelled"""
+
+
+class BackgroundTask:
+    """Runs func(task, *args) on a daemon thread.
+
+    The worker reports back through a queue that the Tk side drains with poll()
+    from a root.after loop, since Tk widgets may only be touched from the main
+    thread. Inside func, task.progress(...) both posts an update and raises
+    TaskCancelled once cancel() has been called.
+    """
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+        self.cancelled = threading.Event()
+        self.messages = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def progress(self, *value):
+        if self.cancelled.is_set():
+            raise TaskCancelled()
+        self.messages.put(("progress", value))
+
+    def poll(self):
+        """Return the messages posted since the last poll as (kind, value) pairs,
+        kind being 'progress', 'done', 'cancelled' or 'error'"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def _run(self):
+        try:
+            result = self.func(self, *self.args)
+        except TaskCancelled:
+            self.messages.put(("cancelled", None))
+        except Exception as e:
+            self.messages.put(("error", e))
+        else:
+            # A cancel that arrives after the work finished still wins
+            if self.cancelled.is_set():
+                self.messages.put(("cancelled", None))
+            else:
+                self.messages.put(("done", result))
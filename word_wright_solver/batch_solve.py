@@ -0,0 +1,95 @@
+## Solve many WORD WRIGHT puzzles without the GUI
+## Reads one puzzle per line as "mandatory,letters,length" (e.g. "a,bcdefg,7") from
+## files or stdin and writes one JSON object per puzzle to stdout, in input order.
+## Blank lines and lines starting with # are skipped.
+##
+## python batch_solve.py words.wwd puzzles.txt > answers.jsonl
+## cat puzzles.txt | python batch_solve.py words.txt --jobs 8
+
+import argparse
+import fileinput
+import json
+import multiprocessing
+import os
+import sys
+
+from solver import WordSolver
+
+# The solver each worker process answers with. Under the fork start method the
+# workers inherit the one the parent loaded; otherwise each loads it once.
+_solver = None
+
+
+def _init_worker(word_file_path, use_answer_table):
+    global _solver
+    if _solver is None:
+        _solver = WordSolver.from_file(word_file_path, use_answer_table=use_answer_table)
+
+
+def parse_puzzle(line):
+    """Parse "mandatory,letters,length" into (mandatory, letters, length)"""
+    parts = [part.strip().lower() for part in line.split(",")]
+    if len(parts) != 3:
+        raise ValueError("expected mandatory,letters,length")
+    mandatory, letters, length = parts
+    if len(mandatory) != 1 or not mandatory.isalpha():
+        raise ValueError("the mandatory letter must be a single letter")
+    if not letters.isalpha():
+        raise ValueError("the additional letters must be letters")
+    return mandatory, letters, int(length)
+
+
+def solve_line(line):
+    """Solve one input line and return its JSON Lines output"""
+    try:
+        mandatory, letters, length = parse_puzzle(line)
+    except ValueError as e:
+        return json.dumps({"input": line, "error": str(e)})
+    words = list(_solver.solve(mandatory, letters, length))
+    return json.dumps({"mandatory": mandatory, "letters": letters, "length": length,
+                       "count": len(words), "words": words})
+
+
+def read_puzzles(inputs):
+    """Yield the puzzle lines of the given files (stdin when there are none)"""
+    with fileinput.input(inputs or ("-",)) as lines:
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def main():
+    global _solver
+    parser = argparse.ArgumentParser(description="Solve WORD WRIGHT puzzles in bulk")
+    parser.add_argument("word_file", help="word file to solve against (.txt or compiled .wwd)")
+    parser.add_argument("puzzles", nargs="*", help="puzzle files (default: stdin)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU, 1 solves in this process)")
+    parser.add_argument("--chunk-size", type=int, default=64,
+                        help="puzzles handed to a worker at a time")
+    parser.add_argument("--answer-table", action="store_true",
+                        help="use the word file's precomputed answer table (solver.py --precompute)")
+    args = parser.parse_args()
+
+    _solver = WordSolver.from_file(args.word_file, use_answer_table=args.answer_table)
+    puzzles = read_puzzles(args.puzzles)
+    output = sys.stdout
+
+    if args.jobs <= 1:
+        for line in puzzles:
+            output.write(solve_line(line) + "\n")
+        return
+
+    # Fork where available so the workers share the dictionary already loaded
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+    with context.Pool(args.jobs, initializer=_init_worker, initargs=(args.word_file, args.answer_table)) as pool:
+        for result in pool.imap(solve_line, puzzles, chunksize=args.chunk_size):
+            output.write(result + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+## Benchmarks for the WORD WRIGHT matching engine
+## Generates synthetic dictionaries, then times loading, index building and
+## cold/warm queries and records peak Python memory for each engine:
+##   linear    the original find_words scan over a list of str
+##   index     WordSolver over a text word file (letter-mask buckets)
+##   compiled  WordSolver over the memory-mapped .wwd form of the same file
+##   numpy     the compiled engine with the vectorized NumPy scan (needs numpy)
+##   dawg      the pruned walk over the word graph (load includes building it)
+##
+## python benchmark.py --sizes 10000 100000 1000000 5000000 --queries 500
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from dictionary import Dictionary, compile_dictionary, load_dictionary, open_compiled
+from solver import WordSolver
+
+# Rough English letter frequencies, so generated words and queries overlap the
+# way real ones do
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+LETTER_WEIGHTS = [8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.2, 0.8, 4.0, 2.4,
+                  6.7, 7.5, 1.9, 0.1, 6.0, 6.3, 9.1, 2.8, 1.0, 2.4, 0.2, 2.0, 0.1]
+
+
+def generate_words(count, rng):
+    """Random words of 4 to 15 letters"""
+    words = []
+    for _ in range(count):
+        length = rng.randint(4, 15)
+        words.append("".join(rng.choices(LETTERS, LETTER_WEIGHTS, k=length)))
+    return words
+
+
+def generate_queries(count, rng):
+    """Random (mandatory, additional, length) puzzles with 7 distinct letters"""
+    queries = []
+    for _ in range(count):
+        letters = []
+        while len(letters) < 7:
+            letter = rng.choices(LETTERS, LETTER_WEIGHTS)[0]
+            if letter not in letters:
+                letters.append(letter)
+        queries.append((letters[0], "".join(letters[1:]), rng.randint(4, 8)))
+    return queries
+
+
+class LinearScan:
+    """The original WordFinderApp.find_words loop, kept as the baseline"""
+
+    def __init__(self, words):
+        self.words = words
+
+    @classmethod
+    def from_file(cls, file_path):
+        with open(file_path, "r", encoding="utf-8") as file:
+            return cls([word.strip().lower() for word in file.readlines() if word.strip()])
+
+    def solve(self, mandatory, additional, length):
+        allowed_chars = set(mandatory + additional)
+        matching_words = []
+        for word in self.words:
+            if len(word) != length:
+                continue
+            if mandatory not in word:
+                continue
+            if all(char in allowed_chars for char in word):
+                matching_words.append(word)
+        matching_words.sort()
+        return matching_words
+
+
+class DawgScan:
+    """Answers queries through WordSolver.solve_dawg"""
+
+    def __init__(self, solver):
+        self.solver = solver
+        solver.dawg()
+
+    def solve(self, mandatory, additional, length):
+        return self.solver.solve_dawg(mandatory, additional, length)
+
+
+def timed(func, *args):
+    """Return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(func, *args):
+    """Peak Python heap allocated while running func, in bytes (memory-mapped
+    pages are not included)"""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def build_index(word_file, words):
+    """Time building the letter-mask index from words already in memory"""
+    WordSolver(Dictionary.from_words(words), use_numpy=False)
+    return word_file
+
+
+def prepare(engine, word_file, words):
+    """Return (build, loader) for an engine: build() does any one-off work and
+    returns the file to load, loader(path) opens it"""
+    if engine == "linear":
+        return lambda: word_file, LinearScan.from_file
+    if engine == "index":
+        return (lambda: build_index(word_file, words),
+                lambda path: WordSolver(load_dictionary(path), use_numpy=False))
+    if engine == "compiled":
+        return (lambda: compile_dictionary(word_file),
+                lambda path: WordSolver(open_compiled(path), use_numpy=False))
+    if engine == "dawg":
+        return (lambda: word_file,
+                lambda path: DawgScan(WordSolver(load_dictionary(path))))
+    if engine == "numpy":
+        return (lambda: compile_dictionary(word_file),
+                lambda path: WordSolver(open_compiled(path), use_numpy=True))
+    raise ValueError(f"unknown engine {engine}")
+
+
+def run_engine(engine, word_file, words, queries):
+    build, loader = prepare(engine, word_file, words)
+    path, build_seconds = timed(build)
+    solver, load_seconds = timed(loader, path)
+    memory = peak_memory(loader, path)
+
+    cold_query = queries[0]
+    _, cold_seconds = timed(lambda: list(solver.solve(*cold_query)))
+    start = time.perf_counter()
+    matches = 0
+    for query in queries:
+        matches += len(list(solver.solve(*query)))
+    warm_seconds = time.perf_counter() - start
+
+    return {
+        "engine": engine,
+        "build_s": round(build_seconds, 4),
+        "load_s": round(load_seconds, 4),
+        "peak_mb": round(memory / 1024 / 1024, 1),
+        "cold_query_ms": round(cold_seconds * 1000, 3),
+        "warm_query_ms": round(warm_seconds * 1000 / len(queries), 3),
+        "queries_per_s": round(len(queries) / warm_seconds, 1) if warm_seconds else None,
+        "matches": matches,
+    }
+
+
+def run(sizes, engines, query_count, seed):
+    rng = random.Random(seed)
+    queries = generate_queries(query_count, rng)
+    workdir = tempfile.mkdtemp(prefix="word_wright_bench_")
+    try:
+        for size in sizes:
+            words = generate_words(size, rng)
+            word_file = os.path.join(workdir, f"words_{size}.txt")
+            with open(word_file, "w", encoding="utf-8") as file:
+                file.write("\n".join(words))
+            for engine in engines:
+                result = run_engine(engine, word_file, words, queries)
+                result["words"] = size
+                yield result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the WORD WRIGHT matching engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="dictionary sizes to generate (default: 10k, 100k, 1M)")
+    parser.add_argument("--engines", nargs="+", default=["linear", "index", "compiled"],
+                        choices=["linear", "index", "compiled", "numpy", "dawg"])
+    parser.add_argument("--queries", type=int, default=200, help="warm queries per run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print JSON Lines instead of a table")
+    args = parser.parse_args()
+
+    columns = ["words", "engine", "build_s", "load_s", "peak_mb",
+               "cold_query_ms", "warm_query_ms", "queries_per_s"]
+    if not args.json:
+        print("".join(f"{column:>15}" for column in columns))
+    for result in run(args.sizes, args.engines, args.queries, args.seed):
+        if args.json:
+            print(json.dumps(result), flush=True)
+        else:
+            print("".join(f"{result[column]!s:>15}" for column in columns), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+## Directed acyclic word graph (DAWG) for the WORD WRIGHT solver
+## A minimal DAWG is a trie whose identical subtrees are merged, so words share
+## their common prefixes and suffixes. It is built from sorted words in one pass
+## (Daciuk et al.'s incremental algorithm) and then packed into flat arrays:
+##   first_edge[n] .. first_edge[n + 1]   the edges leaving node n
+##   edge_letters / edge_targets          the letter and target node of each edge
+##   finals                               one flag per node: a word ends here
+## Node 0 is the root.
+##
+## The solver keeps the Dawg as an extra index next to its length buckets, not
+## instead of them, so building it adds to resident memory rather than saving
+## any: on a 130k-word list with shared stems and suffixes the packed arrays
+## come to about a quarter of the bucket storage, on top of it. It serves prefix
+## queries (the solve server's /prefix); the pruned letter-set walk is 3-20x
+## slower than the letter-mask scan and is only used by benchmark.py.
+
+from array import array
+import heapq
+import itertools
+
+
+class _BuildNode:
+    __slots__ = ("final", "edges", "number")
+
+    def __init__(self):
+        self.final = False
+        self.edges = {}
+        self.number = None
+
+    def signature(self):
+        # Children are already minimized, so their numbers identify them
+        return self.final, tuple((letter, child.number) for letter, child in sorted(self.edges.items()))
+
+
+class Dawg:
+    """A packed, minimized word graph supporting membership, prefix and
+    letter-set queries"""
+
+    def __init__(self, first_edge, edge_letters, edge_targets, finals, word_count):
+        self.first_edge = first_edge
+        self.edge_letters = edge_letters
+        self.edge_targets = edge_targets
+        self.finals = finals
+        self.word_count = word_count
+
+    @classmethod
+    def from_sorted_words(cls, words):
+        """Build a DAWG from words in strictly increasing order"""
+        root = _BuildNode()
+        register = {}
+        unchecked = []  # (parent, letter, child) along the last inserted word
+        previous = ""
+        count = 0
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                signature = child.signature()
+                existing = register.get(signature)
+                if existing is not None:
+                    parent.edges[letter] = existing
+                else:
+                    child.number = len(register) + 1
+                    register[signature] = child
+
+        for word in words:
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else root
+            for letter in word[common:]:
+                child = _BuildNode()
+                node.edges[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            node.final = True
+            previous = word
+            count += 1
+        minimize(0)
+        return cls._pack(root, count)
+
+    @classmethod
+    def from_dictionary(cls, dictionary):
+        """Build a DAWG from a Dictionary, merging its length buckets into
+        alphabetical order without materializing the whole word list"""
+        return cls.from_sorted_words(heapq.merge(*dictionary.buckets.values()))
+
+    def updated(self, added, removed):
+        """Return a new Dawg with the added words inserted and the removed words
+        taken out (both lists of str). Only the nodes on the paths of those words
+        are rebuilt; every other subtree is shared as it is, and a rebuilt node
+        equal to an existing one is merged with it, so the result stays minimal.
+        This Dawg is not modified."""
+        first_edge, letters, targets, finals = (self.first_edge, self.edge_letters,
+                                                self.edge_targets, self.finals)
+        # Every existing node by (final, ((letter, target), ...))
+        register = {}
+        for node in range(len(finals)):
+            start, end = first_edge[node], first_edge[node + 1]
+            register[finals[node], tuple(zip(letters[start:end], targets[start:end]))] = node
+        new_nodes = {}  # number -> signature, numbered after the existing nodes
+
+        def rebuild(node, depth, changes):
+            # changes are the sorted (word, added) pairs sharing this node's prefix
+            final = finals[node] if node is not None else 0
+            edges = {}
+            if node is not None:
+                start, end = first_edge[node], first_edge[node + 1]
+                edges = dict(zip(letters[start:end], targets[start:end]))
+            if len(changes[0][0]) == depth:
+                final = int(changes[0][1])
+                changes = changes[1:]
+            for letter, group in itertools.groupby(changes, key=lambda change: change[0][depth]):
+                code = ord(letter)
+                child = rebuild(edges.get(code), depth + 1, list(group))
+                if child is None:
+                    edges.pop(code, None)
+                else:
+                    edges[code] = child
+            if not final and not edges and depth:
+                return None
+            signature = (final, tuple(sorted(edges.items())))
+            number = register.get(signature)
+            if number is None:
+                number = len(finals) + len(new_nodes)
+                new_nodes[number] = signature
+                register[signature] = number
+            return number
+
+        changes = sorted([(word, True) for word in added] + [(word, False) for word in removed])
+        root = rebuild(0, 0, changes) if changes else 0
+
+        # Pack the nodes reachable from the new root, breadth first like _pack
+        numbers = {root: 0}
+        order = [root]
+        new_first_edge = array("I", [0])
+        new_letters = bytearray()
+        new_targets = array("I")
+        new_finals = bytearray()
+        for node in order:
+            if node in new_nodes:
+                final, edges = new_nodes[node]
+            else:
+                start, end = first_edge[node], first_edge[node + 1]
+                final, edges = finals[node], zip(letters[start:end], targets[start:end])
+            new_finals.append(final)
+            for code, child in edges:
+                if child not in numbers:
+                    numbers[child] = len(order)
+                    order.append(child)
+                new_letters.append(code)
+                new_targets.append(numbers[child])
+            new_first_edge.append(len(new_targets))
+        return Dawg(new_first_edge, bytes(new_letters), new_targets, bytes(new_finals),
+                    self.word_count + len(added) - len(removed))
+
+    @classmethod
+    def _pack(cls, root, word_count):
+        numbers = {id(root): 0}
+        order = [root]
+        # Number the nodes breadth first
+        for node in order:
+            for letter in sorted(node.edges):
+                child = node.edges[letter]
+                if id(child) not in numbers:
+                    numbers[id(child)] = len(order)
+                    order.append(child)
+
+        first_edge = array("I", [0])
+        edge_letters = bytearray()
+        edge_targets = array("I")
+        finals = bytearray(len(order))
+        for n, node in enumerate(order):
+            finals[n] = node.final
+            for letter in sorted(node.edges):
+                edge_letters.append(ord(letter))
+                edge_targets.append(numbers[id(node.edges[letter])])
+            first_edge.append(len(edge_targets))
+        return cls(first_edge, bytes(edge_letters), edge_targets, bytes(finals), word_count)
+
+    def __len__(self):
+        return self.word_count
+
+    def node_count(self):
+        return len(self.finals)
+
+    def nbytes(self):
+        """Memory held by the packed arrays"""
+        return (len(self.first_edge) * self.first_edge.itemsize + len(self.edge_letters)
+                + len(self.edge_targets) * self.edge_targets.itemsize + len(self.finals))
+
+    def child(self, node, letter):
+        """Follow the edge for a letter (a str), or return None"""
+        code = ord(letter)
+        for edge in range(self.first_edge[node], self.first_edge[node + 1]):
+            if self.edge_letters[edge] == code:
+                return self.edge_targets[edge]
+        return None
+
+    def walk(self, prefix):
+        """Return the node reached by a prefix, or None"""
+        node = 0
+        for letter in prefix:
+            node = self.child(node, letter)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, word):
+        node = self.walk(word)
+        return node is not None and bool(self.finals[node])
+
+    def words_with_prefix(self, prefix):
+        """Yield every word starting with prefix, in alphabetical order"""
+        node = self.walk(prefix)
+        if node is None:
+            return
+        # Depth-first with an explicit stack; edges are pushed in reverse so
+        # the smallest letter comes off first
+        stack = [(node, prefix)]
+        first_edge, letters, targets, finals = (self.first_edge, self.edge_letters,
+                                                self.edge_targets, self.finals)
+        while stack:
+            node, word = stack.pop()
+            if finals[node]:
+                yield word
+            for edge in range(first_edge[node + 1] - 1, first_edge[node] - 1, -1):
+                stack.append((targets[edge], word + chr(letters[edge])))
+
+    def match(self, allowed, required, length):
+        """Yield the words of a given length whose letters are all in the allowed
+        mask and that contain every letter in the required mask, in alphabetical
+        order. Subtrees behind a letter that isn't allowed are never entered."""
+        first_edge, letters, targets, finals = (self.first_edge, self.edge_letters,
+                                                self.edge_targets, self.finals)
+        stack = [(0, "", 0)]
+        while stack:
+            node, word, used = stack.pop()
+            if len(word) == length:
+                if finals[node] and used & required == required:
+                    yield word
+                continue
+            for edge in range(first_edge[node + 1] - 1, first_edge[node] - 1, -1):
+                bit = 1 << (letters[edge] - 97)
+                if allowed & bit:
+                    stack.append((targets[edge], word + chr(letters[edge]), used | bit))
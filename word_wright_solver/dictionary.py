@@ -0,0 +1,313 @@
+## Compact word storage for the WORD WRIGHT solver
+## Words of the same length are stored back to back in one bytes buffer, so word i
+## of a bucket lives at data[i * length:(i + 1) * length] and no per-word str
+## objects are kept once loading is done. Each bucket also keeps one letter mask
+## per word in an array.
+##
+## A Dictionary can also be compiled to a binary .wwd file and memory-mapped back,
+## in which case the buckets are views straight into the shared file mapping.
+## Layout (little-endian):
+##   header   "WWDICT01", uint32 bucket count, uint32 reserved
+##   buckets  per bucket: uint32 length, uint32 word count,
+##            uint64 offset of its masks, uint64 offset of its words
+##   data     per bucket: uint32 letter masks, then the sorted words back to back
+
+from array import array
+import mmap
+import os
+import struct
+import sys
+
+# Letter bit for every lowercase ASCII byte value
+LETTER_BITS = {97 + bit: 1 << bit for bit in range(26)}
+
+# Byte translation tables mapping one letter to "1" and every other byte to "0"
+LETTER_FLAGS = [bytes(49 if byte == 97 + bit else 48 for byte in range(256))
+                for bit in range(26)]
+
+# Read word files 1 MiB at a time
+CHUNK_SIZE = 1 << 20
+
+# Compiled dictionary format
+COMPILED_EXTENSION = ".wwd"
+COMPILED_MAGIC = b"WWDICT01"
+HEADER = struct.Struct("<8sII")
+BUCKET_ENTRY = struct.Struct("<IIQQ")
+
+
+def bytes_mask(word):
+    """Letter mask of an a-z only bytes word"""
+    mask = 0
+    for byte in set(word):
+        mask |= LETTER_BITS[byte]
+    return mask
+
+
+class WordBucket:
+    """All words of one length, sorted, in one contiguous buffer"""
+
+    def __init__(self, length, data, masks):
+        self.length = length
+        self.data = data
+        self.masks = masks
+        # 26 letter counts per word, built on first use by letter_counts()
+        self.counts = None
+        # Per-position letter bitsets, built on first use by position_postings(),
+        # and their size in bytes
+        self.postings = None
+        self.postings_bytes = 0
+
+    @classmethod
+    def from_words(cls, length, words):
+        """Build a bucket from a collection of distinct bytes words of the given length"""
+        words = sorted(words)
+        return cls(length, b"".join(words), array("I", map(bytes_mask, words)))
+
+    def __len__(self):
+        return len(self.masks)
+
+    def word(self, i):
+        """Return word i as a str"""
+        start = i * self.length
+        return str(self.data[start:start + self.length], "ascii")
+
+    def __iter__(self):
+        for i in range(len(self.masks)):
+            yield self.word(i)
+
+    def index(self, word):
+        """Return the position of a bytes word in the bucket, or -1 if it isn't there"""
+        length = self.length
+        low, high = 0, len(self.masks)
+        while low < high:
+            middle = (low + high) // 2
+            if bytes(self.data[middle * length:(middle + 1) * length]) < word:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.masks) and bytes(self.data[low * length:(low + 1) * length]) == word:
+            return low
+        return -1
+
+    def letter_counts(self):
+        """Return how often each letter a-z occurs in each word, as one bytes
+        object holding 26 counts per word (word i at [26 * i:26 * i + 26])"""
+        if self.counts is None:
+            counts = bytearray(26 * len(self.masks))
+            data = self.data
+            for i in range(len(self.masks)):
+                row = 26 * i - 97
+                for byte in data[i * self.length:(i + 1) * self.length]:
+                    counts[row + byte] += 1
+            self.counts = bytes(counts)
+        return self.counts
+
+    def position_postings(self):
+        """Return postings[position][letter]: an int with bit i set when word i
+        has that letter (0-25) at that position"""
+        if self.postings is None:
+            postings = []
+            for position in range(self.length):
+                # One byte per word: the letter at this position
+                column = bytes(self.data[position::self.length])
+                letters = []
+                for bit in range(26):
+                    # Turn the column into a string of 0s and 1s, word 0 last,
+                    # and let int() pack it into a bitset
+                    flags = column.translate(LETTER_FLAGS[bit])[::-1]
+                    letters.append(int(flags, 2) if flags else 0)
+                postings.append(letters)
+            self.postings_bytes = sum(sys.getsizeof(posting) for letters in postings
+                                      for posting in letters)
+            self.postings = postings
+        return self.postings
+
+    def nbytes(self):
+        """Approximate memory held by the bucket"""
+        counts_bytes = len(self.counts) if self.counts is not None else 0
+        return (len(self.data) + len(self.masks) * self.masks.itemsize
+                + counts_bytes + self.postings_bytes)
+
+
+class Dictionary:
+    """A deduplicated word list made of one WordBucket per word length"""
+
+    def __init__(self, buckets=None, mapping=None):
+        self.buckets = buckets or {}
+        # The file mapping the buckets point into, for compiled dictionaries
+        self.mapping = mapping
+
+    @classmethod
+    def from_words(cls, words):
+        """Build a dictionary from an iterable of str words"""
+        collector = _BucketCollector()
+        for word in words:
+            collector.add(word.strip().lower().encode("utf-8"))
+        return collector.finish()
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def __iter__(self):
+        for length in sorted(self.buckets):
+            yield from self.buckets[length]
+
+    def bucket(self, length):
+        """Return the bucket for a word length, or None"""
+        return self.buckets.get(length)
+
+    def nbytes(self):
+        """Approximate memory held by all buckets"""
+        return sum(bucket.nbytes() for bucket in self.buckets.values())
+
+    def changed_lengths(self, other):
+        """Return the word lengths whose words differ between this dictionary and
+        another; buckets are sorted, so equal bytes mean equal words"""
+        changed = set()
+        for length in set(self.buckets) | set(other.buckets):
+            old, new = self.buckets.get(length), other.buckets.get(length)
+            if old is None or new is None or len(old) != len(new) or old.data != new.data:
+                changed.add(length)
+        return changed
+
+    def changes(self, other):
+        """Return {length: (added words, removed words)} for every word length
+        whose words differ in another dictionary, both lists sorted"""
+        changes = {}
+        for length in self.changed_lengths(other):
+            old = set(self.buckets.get(length, ()))
+            new = set(other.buckets.get(length, ()))
+            changes[length] = sorted(new - old), sorted(old - new)
+        return changes
+
+    def updated(self, other):
+        """Return (dictionary, changes) for a newer version of this word list,
+        with changes as returned by changes(): the words of other, but sharing
+        this dictionary's buckets (and the letter counts and postings already
+        built on them) for every length whose words did not change. Neither
+        input is modified."""
+        changes = self.changes(other)
+        buckets = {length: bucket if length in changes else self.buckets[length]
+                   for length, bucket in other.buckets.items()}
+        return Dictionary(buckets, other.mapping), changes
+
+
+class _BucketCollector:
+    """Deduplicates words per length while a word file is streamed in"""
+
+    def __init__(self):
+        self.seen = {}
+
+    def add(self, word):
+        # Only a-z words can ever match a puzzle, everything else is dropped here
+        if word and word.isalpha():
+            self.seen.setdefault(len(word), set()).add(word)
+
+    def finish(self):
+        buckets = {}
+        for length in sorted(self.seen):
+            buckets[length] = WordBucket.from_words(length, self.seen[length])
+        self.seen = {}
+        return Dictionary(buckets)
+
+
+def load_dictionary(file_path, chunk_size=CHUNK_SIZE, progress=None):
+    """Stream a one-word-per-line file into a Dictionary.
+    
+    progress, if given, is called as progress(bytes_read, total_bytes) after
+    every chunk.
+    """
+    collector = _BucketCollector()
+    total_bytes = os.path.getsize(file_path)
+    bytes_read = 0
+    with open(file_path, "rb") as file:
+        tail = b""
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            bytes_read += len(chunk)
+            lines = (tail + chunk).lower().split(b"\n")
+            # The last line may continue in the next chunk
+            tail = lines.pop()
+            for line in lines:
+                collector.add(line.strip())
+            if progress:
+                progress(bytes_read, total_bytes)
+        collector.add(tail.lower().strip())
+    return collector.finish()
+
+
+def compiled_path(word_file_path):
+    """Default location of the compiled form of a word file"""
+    return os.path.splitext(word_file_path)[0] + COMPILED_EXTENSION
+
+
+def save_compiled(dictionary, file_path):
+    """Write a Dictionary in the compiled binary format"""
+    lengths = sorted(dictionary.buckets)
+    offset = HEADER.size + BUCKET_ENTRY.size * len(lengths)
+    entries = []
+    for length in lengths:
+        bucket = dictionary.buckets[length]
+        # Masks come first so they stay 4-byte aligned for memoryview.cast
+        offset += -offset % 4
+        masks_offset = offset
+        words_offset = masks_offset + 4 * len(bucket)
+        entries.append((length, len(bucket), masks_offset, words_offset))
+        offset = words_offset + len(bucket.data)
+
+    # Write next to the target and swap it in, so a process that still has the
+    # old file mapped keeps reading the old contents instead of a half-written file
+    temp_path = file_path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(COMPILED_MAGIC, len(lengths), 0))
+        for entry in entries:
+            file.write(BUCKET_ENTRY.pack(*entry))
+        for length, count, masks_offset, words_offset in entries:
+            bucket = dictionary.buckets[length]
+            file.write(b"\0" * (masks_offset - file.tell()))
+            masks = array("I", bucket.masks)
+            if sys.byteorder != "little":
+                masks.byteswap()
+            file.write(masks.tobytes())
+            file.write(bucket.data)
+    os.replace(temp_path, file_path)
+
+
+def compile_dictionary(word_file_path, output_path=None):
+    """Compile a word file to the binary format; returns the output path"""
+    output_path = output_path or compiled_path(word_file_path)
+    save_compiled(load_dictionary(word_file_path), output_path)
+    return output_path
+
+
+def open_compiled(file_path):
+    """Memory-map a compiled dictionary; the pages are shared between every
+    process that opens the same file"""
+    with open(file_path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    magic, bucket_count, _ = HEADER.unpack_from(view, 0)
+    if magic != COMPILED_MAGIC:
+        raise ValueError(f"{file_path} is not a compiled word file")
+
+    buckets = {}
+    for n in range(bucket_count):
+        length, count, masks_offset, words_offset = BUCKET_ENTRY.unpack_from(
+            view, HEADER.size + n * BUCKET_ENTRY.size)
+        masks = view[masks_offset:masks_offset + 4 * count]
+        if sys.byteorder == "little":
+            masks = masks.cast("I")
+        else:
+            masks = array("I", masks)
+            masks.byteswap()
+        buckets[length] = WordBucket(length, view[words_offset:words_offset + count * length], masks)
+    return Dictionary(buckets, mapping)
+
+
+def open_dictionary(file_path, progress=None):
+    """Open a word file, memory-mapping it if it is compiled"""
+    if file_path.endswith(COMPILED_EXTENSION):
+        return open_compiled(file_path)
+    return load_dictionary(file_path, progress=progress)
@@ -0,0 +1,115 @@
+import tkinter as tk
+from tkinter import ttk, font as tkfont
+
+
+class VirtualListbox(ttk.Frame):
+    """A Listbox with a scrollbar that only ever holds the rows currently on screen.
+
+    The full result list stays in a Python list; scrolling moves a window over it
+    and re-renders just the visible rows, so showing thousands of results costs
+    the same as showing a screenful.
+    """
+
+    def __init__(self, parent, height=15):
+        super().__init__(parent)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.items = []
+        self.top = 0            # index of the first visible item
+        self.selected = None    # index of the selected item, if any
+
+        self.listbox = tk.Listbox(self, height=height, exportselection=False)
+        self.listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
+        self.listbox.bind('<Configure>', lambda event: self.render())
+        self.listbox.bind('<<ListboxSelect>>', self.on_select)
+        self.listbox.bind('<MouseWheel>', self.on_mousewheel)
+        self.listbox.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.listbox.bind('<Button-5>', lambda event: self.scroll(3))
+        # The listbox's own keyboard scrolling only knows about the rendered rows
+        self.listbox.bind('<Up>', lambda event: self.move_selection(-1))
+        self.listbox.bind('<Down>', lambda event: self.move_selection(1))
+        self.listbox.bind('<Prior>', lambda event: self.scroll(-self.visible_rows()))
+        self.listbox.bind('<Next>', lambda event: self.scroll(self.visible_rows()))
+
+    def set_items(self, items):
+        """Replace the displayed items and scroll back to the top"""
+        self.items = items
+        self.top = 0
+        self.selected = None
+        self.render()
+
+    def item(self, row):
+        """Return the item shown in a visible row"""
+        return self.items[self.top + row]
+
+    def curselection(self):
+        return self.listbox.curselection()
+
+    def set_font(self, font):
+        self.listbox.configure(font=font)
+        self.render()
+
+    def visible_rows(self):
+        """Number of rows that fit in the listbox at its current size and font"""
+        linespace = tkfont.Font(font=self.listbox.cget('font')).metrics('linespace')
+        return max(1, self.listbox.winfo_height() // linespace + 1)
+
+    def render(self):
+        """Fill the listbox with the rows in view and update the scrollbar"""
+        rows = self.visible_rows()
+        count = len(self.items)
+        self.top = max(0, min(self.top, count - rows + 1))
+
+        self.listbox.delete(0, tk.END)
+        visible = self.items[self.top:self.top + rows]
+        if visible:
+            self.listbox.insert(tk.END, *visible)
+        if self.selected is not None and self.top <= self.selected < self.top + rows:
+            self.listbox.selection_set(self.selected - self.top)
+
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + rows) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows):
+        self.top += rows
+        self.render()
+        return "break"
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * len(self.items))
+            self.render()
+        elif args[0] == 'scroll':
+            step = self.visible_rows() if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+
+    def on_mousewheel(self, event):
+        return self.scroll(-1 if event.delta > 0 else 1)
+
+    def on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.top + selection[0]
+
+    def move_selection(self, step):
+        """Move the selection with the arrow keys, scrolling the window as needed"""
+        if not self.items:
+            return "break"
+        current = self.top - 1 if self.selected is None else self.selected
+        self.selected = max(0, min(len(self.items) - 1, current + step))
+        rows = self.visible_rows() - 1
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + rows:
+            self.top = self.selected - rows + 1
+        self.render()
+        self.listbox.event_generate('<<ListboxSelect>>')
+        return "break"
@@ -0,0 +1,269 @@
+## Local HTTP solve service for WORD WRIGHT
+## Keeps the word indexes resident and answers requests concurrently on asyncio;
+## the matching itself runs on a thread pool so slow scans don't stall the loop.
+##
+## python solve_server.py words.wwd --port 8765
+## python solve_server.py scrabble=scrabble.wwd common=common.txt --unix /tmp/ww.sock
+##
+## GET /solve?mandatory=a&letters=bcdefg&length=7    (length=all for every length)
+##         [&dictionary=name][&max_uses=N][&blanks=N]
+##     mandatory may hold several letters, which must all be used
+## GET /pattern?pattern=s?l??e[&mandatory=l][&letters=abc][&dictionary=name]
+##     letters, when given, limits the words to the mandatory and listed letters
+## GET /anagram?rack=aelrst[&sub=1][&min_length=3][&dictionary=name]
+##     exact anagrams, or with sub=1 every word made from some of the tiles
+## GET /prefix?prefix=sol[&limit=100][&dictionary=name]
+## GET /metrics      request counts, latency percentiles and cache counters
+## GET /health
+
+import argparse
+import asyncio
+from collections import deque
+import itertools
+import json
+import os
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from solver import SolverCache
+
+# How many recent request latencies the percentiles are computed over
+LATENCY_WINDOW = 10000
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """A request that can't be answered; handle turns it into an error response"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class SolveService:
+    """Routes requests to the solvers of the registered dictionaries"""
+
+    def __init__(self, dictionaries, solver_cache=None):
+        self.dictionaries = dictionaries  # name -> word file path
+        self.default_dictionary = next(iter(dictionaries))
+        self.solver_cache = solver_cache or SolverCache()
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.started = time.time()
+
+    def warm_up(self):
+        """Load every dictionary and build its indexes before the first request
+        arrives, so no request pays for building the Dawg or the anagram index"""
+        for path in self.dictionaries.values():
+            solver = self.solver_cache.get(path)
+            solver.dawg()
+            solver.anagram_index()
+            self.solver_cache.recharge(path)
+
+    def parse(self, query):
+        """Split a query string into (params, dictionary name, solver); raises
+        RequestError for an unknown dictionary"""
+        params = {key: values[-1] for key, values in parse_qs(query).items()}
+        name = params.get("dictionary", self.default_dictionary)
+        if name not in self.dictionaries:
+            raise RequestError(404, f"unknown dictionary {name!r}")
+        return params, name, self.solver_cache.get(self.dictionaries[name])
+
+    def solve(self, query):
+        """Answer a /solve query string; returns (status, body)"""
+        params, name, solver = self.parse(query)
+
+        mandatory = params.get("mandatory", "").lower()
+        letters = params.get("letters", "").lower()
+        length = params.get("length", "")
+        max_uses = params.get("max_uses")
+        blanks = params.get("blanks", "0")
+        if not mandatory.isalpha():
+            return 400, {"error": "mandatory must be letters"}
+        if letters and not letters.isalpha():
+            return 400, {"error": "letters must be letters"}
+        if not blanks.isdecimal() or (max_uses is not None and not max_uses.isdecimal()):
+            return 400, {"error": "max_uses and blanks must be numbers"}
+        if max_uses is not None:
+            max_uses = int(max_uses)
+        blanks = int(blanks)
+
+        body = {"dictionary": name, "mandatory": mandatory, "letters": letters}
+        if length == "all":
+            groups = solver.solve_lengths(mandatory, letters, max_uses=max_uses, blanks=blanks)
+            body["count"] = sum(len(words) for words in groups.values())
+            body["words"] = groups
+        elif length.isdecimal():
+            words = list(solver.solve_constrained(mandatory, letters, int(length), max_uses, blanks))
+            body["length"] = int(length)
+            body["count"] = len(words)
+            body["words"] = words
+        else:
+            return 400, {"error": "length must be a number or 'all'"}
+        return 200, body
+
+    def pattern(self, query):
+        """Answer a /pattern query string; returns (status, body)"""
+        params, name, solver = self.parse(query)
+
+        pattern = params.get("pattern", "").lower()
+        mandatory = params.get("mandatory", "").lower()
+        letters = params.get("letters")
+        if not pattern:
+            return 400, {"error": "pattern is required"}
+
+        words = list(solver.solve_pattern(pattern, mandatory, letters))
+        return 200, {"dictionary": name, "pattern": pattern, "count": len(words), "words": words}
+
+    def anagram(self, query):
+        """Answer an /anagram query string; returns (status, body)"""
+        params, name, solver = self.parse(query)
+
+        rack = params.get("rack", "").lower()
+        min_length = params.get("min_length", "1")
+        if not rack.isalpha():
+            return 400, {"error": "rack must be letters"}
+        if not min_length.isdecimal():
+            return 400, {"error": "min_length must be a number"}
+
+        body = {"dictionary": name, "rack": rack}
+        if params.get("sub") == "1":
+            groups = solver.sub_anagrams(rack, int(min_length))
+            body["count"] = sum(len(words) for words in groups.values())
+            body["words"] = groups
+        else:
+            words = solver.anagrams(rack)
+            body["count"] = len(words)
+            body["words"] = words
+        return 200, body
+
+    def prefix(self, query):
+        """Answer a /prefix query string; returns (status, body)"""
+        params, name, solver = self.parse(query)
+
+        prefix = params.get("prefix", "").lower()
+        limit = params.get("limit", "100")
+        if not limit.isdecimal():
+            return 400, {"error": "limit must be a number"}
+
+        words = list(itertools.islice(solver.words_with_prefix(prefix), int(limit)))
+        return 200, {"dictionary": name, "prefix": prefix, "count": len(words), "words": words}
+
+    def metrics(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        cache = self.solver_cache
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": {"p50": percentile(0.50), "p95": percentile(0.95),
+                           "p99": percentile(0.99), "max": percentile(1.0),
+                           "window": len(latencies)},
+            "dictionary_cache": {"hits": cache.hits, "misses": cache.misses,
+                                 "loaded": len(cache.solvers), "bytes": cache.total_bytes},
+            "result_cache": {"hits": cache.result_cache.hits, "misses": cache.result_cache.misses,
+                             "entries": len(cache.result_cache.results)},
+        }
+
+    async def handle(self, reader, writer):
+        """Serve one HTTP request per connection"""
+        start = time.perf_counter()
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            # Headers are not used, just skip them
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            status, body = await self.route(request_line)
+        except RequestError as e:
+            status, body = e.status, {"error": str(e)}
+        except Exception as e:
+            status, body = 500, {"error": str(e)}
+
+        self.requests += 1
+        if status != 200:
+            self.errors += 1
+        payload = json.dumps(body).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\n"
+                     f"Connection: close\r\n\r\n".encode("latin-1") + payload)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+        self.latencies.append(time.perf_counter() - start)
+
+    async def route(self, request_line):
+        if len(request_line) < 2:
+            return 400, {"error": "malformed request"}
+        method, target = request_line[0], request_line[1]
+        if method != "GET":
+            return 405, {"error": "only GET is supported"}
+
+        url = urlsplit(target)
+        handler = {"/solve": self.solve, "/pattern": self.pattern,
+                   "/anagram": self.anagram, "/prefix": self.prefix}.get(url.path)
+        if handler:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, handler, url.query)
+        if url.path == "/metrics":
+            return 200, self.metrics()
+        if url.path == "/health":
+            return 200, {"status": "ok", "dictionaries": list(self.dictionaries)}
+        return 404, {"error": f"no route for {url.path}"}
+
+
+async def serve(service, host="127.0.0.1", port=8765, unix_path=None):
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle, path=unix_path)
+        print(f"Serving on {unix_path}", flush=True)
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        print(f"Serving on http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def parse_dictionaries(specs):
+    """Turn "name=path" or "path" arguments into {name: path}"""
+    dictionaries = {}
+    for spec in specs:
+        name, separator, path = spec.partition("=")
+        if not separator:
+            path = spec
+            name = os.path.splitext(os.path.basename(spec))[0]
+        dictionaries[name] = path
+    return dictionaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local WORD WRIGHT solve service")
+    parser.add_argument("dictionaries", nargs="+", metavar="[NAME=]WORD_FILE",
+                        help="word files to serve; the first one is the default")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead")
+    parser.add_argument("--answer-tables", action="store_true",
+                        help="use the precomputed answer tables of the word files (solver.py --precompute)")
+    args = parser.parse_args()
+
+    service = SolveService(parse_dictionaries(args.dictionaries),
+                           SolverCache(use_answer_tables=args.answer_tables))
+    service.warm_up()
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,791 @@
+## Headless WORD WRIGHT solver
+## Holds the word list and its indexes with no dependency on tkinter, so it can be
+## used from the Tk app, batch jobs, worker processes and benchmarks alike.
+
+import argparse
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+import itertools
+import os
+import threading
+
+from answer_table import AnswerTable, answer_table_path
+from dawg import Dawg
+from dictionary import Dictionary, compile_dictionary, open_dictionary
+
+try:
+    import numpy as np  # pip install numpy (optional, speeds up very large dictionaries)
+except ImportError:
+    np = None
+
+# How many words match_words checks between progress callbacks
+PROGRESS_STEP = 65536
+
+# Mask with all 26 letter bits set
+ALL_LETTERS = (1 << 26) - 1
+
+# Characters that match any letter in a pattern query
+PATTERN_WILDCARDS = "?._"
+
+# Length buckets smaller than this are scanned in Python even when NumPy is
+# available, since the array setup costs more than the loop saves
+NUMPY_MIN_WORDS = 4096
+
+# Every WordSolver gets its own id, so results cached for one word list are
+# never served for another (or for a reload of the same file)
+_solver_ids = itertools.count(1)
+
+
+def letter_mask(word):
+    """Return a 26-bit mask with one bit set per distinct letter a-z in word,
+    or None if the word contains anything other than a-z"""
+    mask = 0
+    for char in word:
+        bit = ord(char) - 97
+        if bit < 0 or bit > 25:
+            return None
+        mask |= 1 << bit
+    return mask
+
+
+def match_words(dictionary, mandatory, additional, length, progress=None):
+    """Yield the words of the given length that use only the mandatory and
+    additional letters and contain the mandatory letter.
+    
+    progress, if given, is called as progress(words_checked, bucket_size) every
+    PROGRESS_STEP words; it may raise to abandon the scan.
+    """
+    allowed = letter_mask(mandatory + additional)
+    required = letter_mask(mandatory)
+    bucket = dictionary.bucket(length)
+    if allowed is None or not required or bucket is None:
+        return
+    # A word matches when its letters are a subset of the allowed letters
+    # and include the mandatory one: one AND per word in the length bucket
+    disallowed = ~allowed
+    masks = bucket.masks
+    total = len(masks)
+    step = PROGRESS_STEP if progress else total
+    for start in range(0, total, step or 1):
+        for i in range(start, min(start + step, total)):
+            mask = masks[i]
+            if not mask & disallowed and mask & required:
+                yield bucket.word(i)
+        if progress:
+            progress(min(start + step, total), total)
+
+
+def match_indices_numpy(bucket, allowed, required):
+    """Return the indices of the words in a bucket that only use the allowed
+    letters and contain a required one, using vectorized mask tests"""
+    masks = np.frombuffer(bucket.masks, dtype=np.uint32)
+    disallowed = np.uint32(~allowed & ALL_LETTERS)
+    return np.flatnonzero(((masks & disallowed) == 0) & ((masks & np.uint32(required)) != 0))
+
+
+def match_words_numpy(dictionary, mandatory, additional, length, progress=None):
+    """match_words on the NumPy path; yields the same words in the same order"""
+    allowed = letter_mask(mandatory + additional)
+    required = letter_mask(mandatory)
+    bucket = dictionary.bucket(length)
+    if allowed is None or not required or bucket is None:
+        return
+    indices = match_indices_numpy(bucket, allowed, required)
+    if progress:
+        progress(len(bucket), len(bucket))
+    for i in indices.tolist():
+        yield bucket.word(i)
+
+
+def match_constrained(dictionary, required, allowed, length, max_uses=None, blanks=0,
+                      progress=None):
+    """Yield the words of the given length that contain every letter in the
+    required mask and can be spelled from the allowed letters when each letter
+    may be used at most max_uses times (unlimited when None) and up to blanks
+    wildcard tiles stand in for any other letter.
+    
+    The letter masks rule out most words with one AND; only words that pass
+    that are checked against the bucket's letter-count vectors.
+    """
+    bucket = dictionary.bucket(length)
+    if bucket is None:
+        return
+    masks = bucket.masks
+    disallowed = ~allowed & ALL_LETTERS
+    counts = bucket.letter_counts() if max_uses is not None or blanks else None
+    total = len(masks)
+    for i, mask in enumerate(masks):
+        if progress and i and not i % PROGRESS_STEP:
+            progress(i, total)
+        if mask & required != required:
+            continue
+        extra = mask & disallowed
+        if extra and bin(extra).count("1") > blanks:
+            continue
+        if counts is None:
+            yield bucket.word(i)
+            continue
+        
+        # Blanks needed: every use of a letter outside the allowed set, plus
+        # every use of an allowed letter beyond max_uses
+        row = 26 * i
+        needed = 0
+        bits = mask
+        while bits:
+            bit = (bits & -bits).bit_length() - 1
+            bits &= bits - 1
+            uses = counts[row + bit]
+            if extra >> bit & 1:
+                needed += uses
+            elif max_uses is not None and uses > max_uses:
+                needed += uses - max_uses
+        if needed <= blanks:
+            yield bucket.word(i)
+
+
+def bit_indices(bits):
+    """Yield the positions of the set bits of an int, lowest first"""
+    text = bin(bits)[:1:-1]  # lowest bit first, without the "0b"
+    i = text.find("1")
+    while i != -1:
+        yield i
+        i = text.find("1", i + 1)
+
+
+def match_pattern(dictionary, pattern, required=0, allowed=None):
+    """Yield the words that fit a pattern such as "s?l??e" (PATTERN_WILDCARDS
+    match any letter), contain every letter in the required mask and, when
+    allowed is given, use only allowed letters.
+    
+    The known positions are answered by intersecting the bucket's positional
+    bitsets; the letter masks are only checked for the words left after that.
+    """
+    bucket = dictionary.bucket(len(pattern))
+    if bucket is None:
+        return
+    postings = bucket.position_postings()
+    bits = (1 << len(bucket)) - 1
+    for position, char in enumerate(pattern):
+        if char in PATTERN_WILDCARDS:
+            continue
+        bit = ord(char) - 97
+        if bit < 0 or bit > 25:
+            return
+        bits &= postings[position][bit]
+        if not bits:
+            return
+    
+    disallowed = ~allowed & ALL_LETTERS if allowed is not None else 0
+    masks = bucket.masks
+    for i in bit_indices(bits):
+        mask = masks[i]
+        if mask & required == required and not mask & disallowed:
+            yield bucket.word(i)
+
+
+def bisect_signature(signatures, length, signature, upper=False):
+    """Return where a signature belongs among sorted length-byte signatures
+    stored back to back: before any equal ones, or after them with upper"""
+    low, high = 0, len(signatures) // length
+    while low < high:
+        middle = (low + high) // 2
+        entry = signatures[middle * length:(middle + 1) * length]
+        if entry < signature or (upper and entry == signature):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+class AnagramIndex:
+    """Finds the words that share a sorted-letter signature, so the anagrams of
+    a rack are one binary search per distinct sub-multiset of the rack instead
+    of a scan of the dictionary.
+    
+    Per word length the index is two flat buffers: the signature of every word,
+    sorted and stored back to back in one bytes object, and an array of the word
+    indices in the same order, so it costs length + 4 bytes per word.
+    """
+    
+    def __init__(self, dictionary, previous=None, changes=None):
+        """previous, if given, is an index over an earlier version of the
+        dictionary and changes the {length: (added words, removed words)}
+        between the two (see Dictionary.changes): unchanged lengths reuse the
+        previous buffers and changed ones are patched from them"""
+        self.dictionary = dictionary
+        # length -> (sorted signatures back to back, array("I") of word indices)
+        self.by_length = {}
+        changes = changes or {}
+        for length, bucket in dictionary.buckets.items():
+            if previous is not None and length in previous.by_length:
+                if length in changes:
+                    self.by_length[length] = previous.patched(bucket, *changes[length])
+                else:
+                    self.by_length[length] = previous.by_length[length]
+                continue
+            data = bucket.data
+            signatures = [bytes(sorted(data[i * length:(i + 1) * length]))
+                          for i in range(len(bucket))]
+            # The sort is stable, so the words of one signature stay in word order
+            order = sorted(range(len(bucket)), key=signatures.__getitem__)
+            self.by_length[length] = (b"".join(map(signatures.__getitem__, order)),
+                                      array("I", order))
+            
+    def patched(self, bucket, added, removed):
+        """Return the (signatures, indices) buffers for a newer version of one of
+        this index's length buckets, given the words added to and removed from
+        it. Only those words are sorted into signatures; the other entries are
+        copied over in runs with their word positions moved. This index is not
+        modified."""
+        length = bucket.length
+        old_bucket = self.dictionary.bucket(length)
+        signatures, indices = self.by_length[length]
+        gone = []
+        dropped = []  # Entries of the removed words
+        for word in removed:
+            word = word.encode("ascii")
+            i = old_bucket.index(word)
+            gone.append(i)
+            first = bisect_signature(signatures, length, bytes(sorted(word)))
+            dropped.append(indices.index(i, first))
+        gone.sort()
+        dropped.sort()
+        new = sorted(bucket.index(word.encode("ascii")) for word in added)
+        
+        # Old position -> new position (-1 for a removed word). The words that
+        # stay keep their order, so this is built one run of them at a time.
+        staying = []
+        start = 0
+        for end in new + [len(bucket)]:
+            staying.extend(range(start, end))
+            start = end + 1
+        positions = []
+        taken = start = 0
+        for end in gone + [len(old_bucket)]:
+            positions.extend(staying[taken:taken + end - start])
+            taken += end - start
+            positions.append(-1)
+            start = end + 1
+        positions.pop()  # The -1 after the last run
+        
+        # Copy the entries between the dropped ones, with their new positions
+        move = positions.__getitem__
+        parts = []
+        kept = array("I")
+        start = 0
+        for end in dropped + [len(indices)]:
+            parts.append(signatures[start * length:end * length])
+            kept.extend(map(move, indices[start:end]))
+            start = end + 1
+        kept_signatures = b"".join(parts)
+        
+        # Then slot in the added words, after any word of the same signature
+        # that comes before them in the bucket
+        inserts = []
+        for i in new:
+            signature = bytes(sorted(bucket.data[i * length:(i + 1) * length]))
+            first = bisect_signature(kept_signatures, length, signature)
+            last = bisect_signature(kept_signatures, length, signature, upper=True)
+            inserts.append((bisect_left(kept, i, first, last), signature, i))
+        inserts.sort()
+        parts = []
+        result = array("I")
+        start = 0
+        for end, signature, i in inserts:
+            parts.append(kept_signatures[start * length:end * length])
+            parts.append(signature)
+            result.extend(kept[start:end])
+            result.append(i)
+            start = end
+        parts.append(kept_signatures[start * length:])
+        result.extend(kept[start:])
+        return b"".join(parts), result
+        
+    def lookup(self, signature):
+        """Return the words with exactly the letters of a signature"""
+        length = len(signature)
+        if length not in self.by_length:
+            return []
+        signatures, indices = self.by_length[length]
+        first = bisect_signature(signatures, length, signature)
+        last = bisect_signature(signatures, length, signature, upper=True)
+        bucket = self.dictionary.bucket(length)
+        return [bucket.word(i) for i in indices[first:last]]
+        
+    def sub_signatures(self, rack, min_length=1):
+        """Yield the signature of every distinct sub-multiset of the rack with at
+        least min_length letters"""
+        counts = sorted(Counter(rack.encode("ascii")).items())
+        
+        def walk(position, prefix):
+            if position == len(counts):
+                if len(prefix) >= min_length:
+                    yield prefix
+                return
+            letter, available = counts[position]
+            for uses in range(available + 1):
+                yield from walk(position + 1, prefix + bytes([letter]) * uses)
+                
+        return walk(0, b"")
+        
+    def nbytes(self):
+        """Memory held by the signature and index buffers"""
+        return sum(len(signatures) + indices.itemsize * len(indices)
+                   for signatures, indices in self.by_length.values())
+
+
+class Candidates:
+    """The matches of every length for one mandatory letter and allowed letter set.
+    
+    Dropping letters or changing the length only ever narrows a query, so a new
+    query that is covered by these candidates can be answered by filtering them
+    instead of scanning the dictionary again.
+    """
+    
+    def __init__(self, mandatory, allowed, entries):
+        self.mandatory = mandatory
+        self.allowed = allowed
+        self.entries = entries  # [(mask, word)] in length, then word order
+        
+    def covers(self, mandatory, allowed):
+        """True if every match of the query is among these candidates"""
+        return mandatory == self.mandatory and not allowed & ~self.allowed
+        
+    def narrow(self, allowed):
+        """Return the candidates that only use the given letters"""
+        if allowed == self.allowed:
+            return self
+        disallowed = ~allowed
+        entries = [(mask, word) for mask, word in self.entries if not mask & disallowed]
+        return Candidates(self.mandatory, allowed, entries)
+        
+    def of_length(self, length):
+        return [word for mask, word in self.entries if len(word) == length]
+        
+    def by_length(self, lengths=None):
+        """Group the candidates as {length: [words]}, optionally only some lengths"""
+        groups = {}
+        for mask, word in self.entries:
+            groups.setdefault(len(word), []).append(word)
+        if lengths is not None:
+            groups = {length: groups[length] for length in lengths if length in groups}
+        return groups
+
+
+class ResultCache:
+    """A bounded LRU of solve() results keyed by
+    (solver id, mandatory letter, sorted letter set, length), so puzzles that only
+    differ in the order of their letters share one entry"""
+    
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        
+    @staticmethod
+    def key(solver_id, mandatory, additional, length):
+        return solver_id, mandatory, "".join(sorted(set(mandatory + additional))), length
+        
+    def get(self, key):
+        """Return the cached words for a key, or None"""
+        with self.lock:
+            words = self.results.get(key)
+            if words is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.results.move_to_end(key)
+            return words
+        
+    def put(self, key, words):
+        with self.lock:
+            self.results[key] = words
+            self.results.move_to_end(key)
+            while len(self.results) > self.max_entries:
+                self.results.popitem(last=False)
+                
+    def invalidate(self, solver_id):
+        """Drop every result cached for one solver"""
+        with self.lock:
+            for key in [key for key in self.results if key[0] == solver_id]:
+                del self.results[key]
+                
+    def carry_over(self, old_id, new_id, changes):
+        """Hand one solver's cached results to its updated replacement, dropping
+        only those an added or removed word would be a match for (changes as
+        returned by Dictionary.changes)"""
+        changed_masks = {length: {letter_mask(word) for word in added + removed}
+                         for length, (added, removed) in changes.items()}
+        with self.lock:
+            for key in [key for key in self.results if key[0] == old_id]:
+                words = self.results.pop(key)
+                allowed = letter_mask(key[2])
+                required = letter_mask(key[1])
+                if allowed is None or required is None:
+                    continue  # Letters outside a-z, not worth carrying over
+                disallowed = ~allowed
+                if not any(not mask & disallowed and mask & required
+                           for mask in changed_masks.get(key[3], ())):
+                    self.results[(new_id,) + key[1:]] = words
+
+
+class WordSolver:
+    """Owns a Dictionary (words and letter masks bucketed by length),
+    (optionally) an answer table and (optionally) a shared ResultCache"""
+    
+    def __init__(self, dictionary=None, answer_table=None, result_cache=None, use_numpy=None):
+        self.dictionary = dictionary or Dictionary()
+        self.answer_table = answer_table
+        self.result_cache = result_cache
+        self.solver_id = next(_solver_ids)
+        self._anagram_index = None
+        self._anagram_lock = threading.Lock()
+        self._dawg = None
+        self._dawg_lock = threading.Lock()
+        # Scan large buckets with NumPy when it is installed, unless told otherwise
+        if use_numpy is None:
+            use_numpy = np is not None
+        self.use_numpy = use_numpy and np is not None
+        
+    @classmethod
+    def from_words(cls, words):
+        """Build a solver from an iterable of words"""
+        return cls(Dictionary.from_words(words))
+        
+    @classmethod
+    def from_file(cls, file_path, progress=None, use_answer_table=False):
+        """Load a word file (text or compiled). With use_answer_table, its answer
+        table is memory-mapped too if one is present and up to date."""
+        dictionary = open_dictionary(file_path, progress)
+        answer_table = None
+        table_path = answer_table_path(file_path)
+        if (use_answer_table and os.path.exists(table_path)
+                and os.path.getmtime(table_path) >= os.path.getmtime(file_path)):
+            answer_table = AnswerTable.open(table_path)
+            if answer_table.word_count != len(dictionary):
+                answer_table = None  # Built from another version of the word list
+        return cls(dictionary, answer_table)
+        
+    def updated(self, dictionary):
+        """Return (solver, changes) for a newer version of this solver's word
+        list, with changes the {length: (added words, removed words)} between
+        the two.
+        
+        Only the length buckets whose words changed are taken from the new
+        dictionary. The anagram index and the Dawg, when built, are patched with
+        just the added and removed words, and the cached results that none of
+        those words would match carry over. This solver is left untouched, so
+        queries still running on it finish against the old words.
+        """
+        dictionary, changes = self.dictionary.updated(dictionary)
+        # Any change leaves the answer table stale: its references are positions
+        answer_table = self.answer_table if not changes else None
+        solver = WordSolver(dictionary, answer_table, self.result_cache, self.use_numpy)
+        with self._anagram_lock:
+            if self._anagram_index is not None:
+                solver._anagram_index = AnagramIndex(dictionary, self._anagram_index, changes)
+        with self._dawg_lock:
+            solver._dawg = self._dawg
+        if solver._dawg is not None and changes:
+            added = sorted(word for words, _ in changes.values() for word in words)
+            removed = sorted(word for _, words in changes.values() for word in words)
+            solver._dawg = solver._dawg.updated(added, removed)
+        if self.result_cache is not None:
+            self.result_cache.carry_over(self.solver_id, solver.solver_id, changes)
+        return solver, changes
+        
+    def __len__(self):
+        return len(self.dictionary)
+        
+    def solve(self, mandatory, additional, length, progress=None):
+        """Return an iterator over the matching words in alphabetical order;
+        progress is passed on to match_words when the index has to be scanned"""
+        mandatory = mandatory.lower()
+        additional = additional.lower()
+        # Letters outside a-z match nothing, so there's nothing worth caching
+        if self.result_cache is not None and letter_mask(mandatory + additional) is not None:
+            key = ResultCache.key(self.solver_id, mandatory, additional, length)
+            words = self.result_cache.get(key)
+            if words is None:
+                words = list(self._solve(mandatory, additional, length, progress))
+                self.result_cache.put(key, words)
+            return iter(words)
+        return self._solve(mandatory, additional, length, progress)
+        
+    def _solve(self, mandatory, additional, length, progress):
+        # The answer table answers known letter sets with one lookup, anything
+        # else falls back to the letter-mask index
+        if self.answer_table is not None:
+            allowed = letter_mask(mandatory + additional)
+            required = letter_mask(mandatory)
+            if allowed is not None and required:
+                matches = self.answer_table.lookup(self.dictionary, required, allowed, length)
+                if matches is not None:
+                    return matches
+        bucket = self.dictionary.bucket(length)
+        if self.use_numpy and bucket is not None and len(bucket) >= NUMPY_MIN_WORDS:
+            return match_words_numpy(self.dictionary, mandatory, additional, length, progress)
+        return match_words(self.dictionary, mandatory, additional, length, progress)
+        
+    def solve_constrained(self, mandatory, additional, length, max_uses=None, blanks=0,
+                          progress=None):
+        """Like solve, but mandatory may hold several letters that must all be
+        used, each letter may be limited to max_uses uses, and up to blanks
+        wildcard tiles may stand in for letters that are not available"""
+        mandatory = mandatory.lower()
+        additional = additional.lower()
+        if len(mandatory) == 1 and max_uses is None and not blanks:
+            return self.solve(mandatory, additional, length, progress)
+        allowed = letter_mask(mandatory + additional)
+        required = letter_mask(mandatory)
+        if allowed is None or required is None:
+            return iter(())
+        return match_constrained(self.dictionary, required, allowed, length,
+                                 max_uses, blanks, progress)
+        
+    def solve_pattern(self, pattern, mandatory="", additional=None):
+        """Return an iterator over the words matching a crossword-style pattern
+        like "s?l??e", optionally limited to words that contain every mandatory
+        letter and (when additional is given) only use the mandatory and
+        additional letters"""
+        pattern = pattern.lower()
+        mandatory = mandatory.lower()
+        required = letter_mask(mandatory)
+        allowed = None
+        if additional is not None:
+            allowed = letter_mask(mandatory + additional.lower())
+        if required is None or (additional is not None and allowed is None):
+            return iter(())
+        return match_pattern(self.dictionary, pattern, required, allowed)
+        
+    def anagram_index(self):
+        """Return the AnagramIndex, building it on first use"""
+        with self._anagram_lock:
+            if self._anagram_index is None:
+                self._anagram_index = AnagramIndex(self.dictionary)
+            return self._anagram_index
+            
+    def anagrams(self, rack):
+        """Return the words that use exactly the letters of the rack, sorted"""
+        rack = rack.lower()
+        if letter_mask(rack) is None:
+            return []
+        return self.anagram_index().lookup(bytes(sorted(rack.encode("ascii"))))
+        
+    def sub_anagrams(self, rack, min_length=1):
+        """Return {length: [words]} for every word that can be made from some of
+        the letters of the rack (each tile used once), in increasing length order"""
+        rack = rack.lower()
+        if letter_mask(rack) is None:
+            return {}
+        index = self.anagram_index()
+        groups = {}
+        for signature in index.sub_signatures(rack, min_length):
+            words = index.lookup(signature)
+            if words:
+                groups.setdefault(len(signature), []).extend(words)
+        return {length: sorted(groups[length]) for length in sorted(groups)}
+        
+    def dawg(self):
+        """Return the Dawg of the word list, building it on first use. It is
+        held in addition to the length buckets, so it adds to nbytes()."""
+        with self._dawg_lock:
+            if self._dawg is None:
+                self._dawg = Dawg.from_dictionary(self.dictionary)
+            return self._dawg
+            
+    def words_with_prefix(self, prefix):
+        """Return an iterator over the words starting with prefix, in
+        alphabetical order"""
+        prefix = prefix.lower()
+        if letter_mask(prefix) is None:
+            return iter(())
+        return self.dawg().words_with_prefix(prefix)
+        
+    def solve_dawg(self, mandatory, additional, length):
+        """solve() answered by walking the Dawg, skipping every subtree whose
+        next letter is not allowed. Measured 3-20x slower than the mask scan
+        solve() uses, so it is only here for benchmark.py."""
+        mandatory = mandatory.lower()
+        allowed = letter_mask(mandatory + additional.lower())
+        required = letter_mask(mandatory)
+        if allowed is None or not required:
+            return iter(())
+        return self.dawg().match(allowed, required, length)
+        
+    def solve_lengths(self, mandatory, additional, lengths=None, progress=None,
+                      max_uses=None, blanks=0):
+        """Answer a query for several lengths at once (every length in the
+        dictionary when lengths is None) in one pass over the length buckets,
+        with the same optional constraints as solve_constrained.
+        
+        Returns {length: [words]} in increasing length order, leaving out
+        lengths without matches.
+        """
+        if lengths is None:
+            lengths = sorted(self.dictionary.buckets)
+        groups = {}
+        for length in sorted(lengths):
+            words = list(self.solve_constrained(mandatory, additional, length,
+                                                max_uses, blanks, progress))
+            if words:
+                groups[length] = words
+        return groups
+        
+    def candidates(self, mandatory, additional, previous=None, progress=None):
+        """Return the Candidates for a query, filtered from previous when that
+        covers the query and scanned from the dictionary otherwise"""
+        mandatory = mandatory.lower()
+        additional = additional.lower()
+        allowed = letter_mask(mandatory + additional)
+        if allowed is None or not letter_mask(mandatory):
+            return Candidates(mandatory, 0, [])
+        if previous is not None and previous.covers(mandatory, allowed):
+            return previous.narrow(allowed)
+        
+        groups = self.solve_lengths(mandatory, additional, progress=progress)
+        entries = [(letter_mask(word), word) for words in groups.values() for word in words]
+        return Candidates(mandatory, allowed, entries)
+        
+    def nbytes(self):
+        """Approximate memory held by the dictionary, the answer table, the
+        anagram index and the Dawg"""
+        table_bytes = self.answer_table.nbytes() if self.answer_table is not None else 0
+        anagram_bytes = self._anagram_index.nbytes() if self._anagram_index else 0
+        dawg_bytes = self._dawg.nbytes() if self._dawg else 0
+        return self.dictionary.nbytes() + table_bytes + anagram_bytes + dawg_bytes
+
+
+class SolverCache:
+    """Keeps recently used WordSolvers by file path, evicting the least recently
+    used ones once their combined footprint goes over max_bytes.
+    
+    Indexes a solver builds lazily (anagram index, Dawg, letter counts, postings)
+    are charged to it on its next get, or right away through recharge.
+    
+    The solvers share one ResultCache; a solver's cached results are dropped when
+    it is evicted, and when its file changes only the results an added or
+    removed word would match are dropped.
+    """
+    
+    def __init__(self, max_bytes=512 * 1024 * 1024, result_cache=None, use_answer_tables=False):
+        self.max_bytes = max_bytes
+        self.use_answer_tables = use_answer_tables
+        self.result_cache = result_cache or ResultCache()
+        self.solvers = OrderedDict()  # path -> (solver, nbytes, mtime)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # Loads may run on worker threads
+        self.lock = threading.Lock()
+        
+    def __contains__(self, file_path):
+        return file_path in self.solvers
+        
+    def mtime(self, file_path):
+        """Modification time of a cached word file when it was loaded, or None"""
+        with self.lock:
+            entry = self.solvers.get(file_path)
+            return entry[2] if entry is not None else None
+            
+    def get(self, file_path, progress=None):
+        """Return the solver for a word file, loading it on a miss or when the
+        file changed since it was loaded"""
+        return self.refresh(file_path, progress)[0]
+        
+    def refresh(self, file_path, progress=None):
+        """Like get, but returns (solver, changes). When a cached file has
+        changed it is read again and the solver is updated incrementally (see
+        WordSolver.updated); changes is None after a full load and empty when
+        nothing changed."""
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            # Missing right now (renamed, deleted or halfway through an editor's
+            # save): keep serving the words already loaded, if there are any
+            with self.lock:
+                if file_path not in self.solvers:
+                    raise
+                mtime = self.solvers[file_path][2]
+        with self.lock:
+            entry = self.solvers.get(file_path)
+            if entry is not None and entry[2] == mtime:
+                self.hits += 1
+                self.solvers.move_to_end(file_path)
+                self._charge(file_path)
+                return entry[0], {}
+            self.misses += 1
+        
+        changes = None
+        if entry is None:
+            solver = WordSolver.from_file(file_path, progress, self.use_answer_tables)
+            solver.result_cache = self.result_cache
+        else:
+            solver, changes = entry[0].updated(open_dictionary(file_path, progress))
+        with self.lock:
+            self._discard(file_path)
+            self.solvers[file_path] = (solver, 0, mtime)
+            self._charge(file_path)
+        return solver, changes
+        
+    def recharge(self, file_path):
+        """Re-measure a cached solver after building one of its indexes, evicting
+        other solvers if the cache is now over max_bytes"""
+        with self.lock:
+            if file_path in self.solvers:
+                self._charge(file_path)
+                
+    def _charge(self, file_path):
+        solver, nbytes, mtime = self.solvers[file_path]
+        new_nbytes = solver.nbytes()
+        self.solvers[file_path] = (solver, new_nbytes, mtime)
+        self.total_bytes += new_nbytes - nbytes
+        # Evict from the cold end, but always keep the solver being charged
+        while self.total_bytes > self.max_bytes and len(self.solvers) > 1:
+            coldest = next(iter(self.solvers))
+            if coldest == file_path:
+                self.solvers.move_to_end(file_path)
+                coldest = next(iter(self.solvers))
+            self._discard(coldest)
+        
+    def discard(self, file_path):
+        """Drop a word file from the cache if it is there"""
+        with self.lock:
+            self._discard(file_path)
+            
+    def _discard(self, file_path):
+        entry = self.solvers.pop(file_path, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+            self.result_cache.invalidate(entry[0].solver_id)
+
+
+def precompute(word_file_path, output_path=None):
+    """Build the answer table for a word file and save it next to the file"""
+    output_path = output_path or answer_table_path(word_file_path)
+    table = AnswerTable.build(open_dictionary(word_file_path))
+    table.save(output_path)
+    print(f"Wrote {len(table)} letter sets to {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WORD WRIGHT solver")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--precompute", metavar="WORD_FILE",
+                        help="build the answer table for WORD_FILE")
+    action.add_argument("--compile", metavar="WORD_FILE",
+                        help="compile WORD_FILE to the binary .wwd format")
+    parser.add_argument("-o", "--output", help="where to write the output file")
+    args = parser.parse_args()
+    
+    if args.precompute:
+        precompute(args.precompute, args.output)
+    else:
+        print(f"Wrote {compile_dictionary(args.compile, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+## Tests for the headless WORD WRIGHT solver
+## python -m unittest test_solver    (from this folder)
+
+import os
+import tempfile
+import time
+import unittest
+
+from solver import ResultCache, SolverCache
+
+
+class ReloadTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "words.txt")
+        self.write_words(["stare", "tears", "rates", "solar"])
+
+    def write_words(self, words):
+        with open(self.path, "w") as file:
+            file.write("\n".join(words))
+        # Make sure the change is seen even on coarse mtime clocks
+        stamp = time.time() + len(words)
+        os.utime(self.path, (stamp, stamp))
+
+    def test_reload_after_query_with_letters_outside_a_z(self):
+        cache = SolverCache()
+        solver = cache.get(self.path)
+        self.assertEqual(list(solver.solve("é", "tare", 5)), [])
+        self.assertEqual(list(solver.solve("s", "tare", 5)), ["rates", "stare", "tears"])
+
+        # A key with letters outside a-z can't be turned into a mask; one from
+        # before solve() stopped caching them must not break the reload either
+        result_cache = cache.result_cache
+        result_cache.put(ResultCache.key(solver.solver_id, "é", "tare", 5), [])
+
+        self.write_words(["stare", "tears", "rates", "solar", "aster"])
+        solver, changes = cache.refresh(self.path)
+        self.assertEqual(changes, {5: (["aster"], [])})
+        self.assertEqual(list(solver.solve("s", "tare", 5)),
+                         ["aster", "rates", "stare", "tears"])
+        self.assertEqual(list(solver.solve("é", "tare", 5)), [])
+        self.assertFalse(any(key[1] == "é" for key in result_cache.results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import webbrowser
+import os
+
+from background import BackgroundTask
+from results_view import VirtualListbox
+from solver import SolverCache, WordSolver
+
+# How often the main loop checks on the worker thread, in milliseconds
+POLL_INTERVAL = 50
+
+# How long live search waits for typing to pause, in milliseconds
+LIVE_SEARCH_DELAY = 250
+
+# How often a watched word file is checked for changes, in milliseconds
+WATCH_INTERVAL = 1000
+
 
 class WordFinderApp:
     def __init__(self, root):
@@ -13,9 +28,30 @@ class WordFinderApp:
         self.additional_chars = tk.StringVar()
         self.word_length = tk.IntVar(value=7)  # Default total length
         self.font_size = tk.IntVar(value=12)
-        
-        # Word list
-        self.words = []
+        self.dictionary_name = tk.StringVar()
+        self.live_search_on = tk.BooleanVar(value=False)
+        self.all_lengths = tk.BooleanVar(value=False)
+        self.watch_file = tk.BooleanVar(value=False)
+        
+        # Word list and its indexes, plus every word file loaded so far
+        # (display name -> path) with their solvers kept in a bounded cache
+        self.solver = WordSolver()
+        self.solver_path = None
+        self.dictionary_paths = {}
+        self.solver_cache = SolverCache()
+        
+        # The load and the search currently running on worker threads. They are
+        # kept apart so a new search only ever cancels the previous search.
+        self.load_task = None
+        self.search_task = None
+        
+        # Live search: the pending debounce timer and the last candidates found
+        self.live_after_id = None
+        self.live_candidates = None
+        
+        # File watcher: the (path, mtime) of the last reload that failed, so a
+        # broken file is not retried until it changes again
+        self.failed_reload = None
         
         # Store references to all widgets that need font updates
         self.font_widgets = []
@@ -28,7 +64,15 @@ class WordFinderApp:
         self.additional_chars.trace('w', self.validate_additional_chars)
         self.font_size.trace('w', self.update_fonts)
         
+        # Live search follows every input change
+        self.mandatory_char.trace('w', self.schedule_live_search)
+        self.additional_chars.trace('w', self.schedule_live_search)
+        self.word_length.trace('w', self.schedule_live_search)
+        self.live_search_on.trace('w', self.schedule_live_search)
+        self.all_lengths.trace('w', self.toggle_all_lengths)
+        
         self.setup_ui()
+        self.root.after(WATCH_INTERVAL, self.watch_dictionary)
         
     def setup_ui(self):
         # Main frame
@@ -40,11 +84,17 @@ class WordFinderApp:
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(1, weight=1)
         
-        # Row 0: Load File Button
+        # Row 0: Load File Button and Dictionary Selector
         load_button = ttk.Button(main_frame, text="Load Word File", command=self.load_file)
-        load_button.grid(row=0, column=0, columnspan=2, pady=(0, 10), sticky=tk.W)
+        load_button.grid(row=0, column=0, pady=(0, 10), sticky=tk.W)
         self.font_widgets.append(('ttk_button', load_button))
         
+        self.dictionary_combo = ttk.Combobox(main_frame, textvariable=self.dictionary_name,
+                                             state="readonly", width=18)
+        self.dictionary_combo.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=(0, 10))
+        self.dictionary_combo.bind("<<ComboboxSelected>>", self.select_dictionary)
+        self.font_widgets.append(('entry', self.dictionary_combo))
+        
         # Row 1: Mandatory Character
         label1 = ttk.Label(main_frame, text="Mandatory Character:")
         label1.grid(row=1, column=0, sticky=tk.W, padx=(0, 10))
@@ -76,15 +126,34 @@ class WordFinderApp:
         self.length_slider.pack(side=tk.LEFT)
         self.font_widgets.append(('scale', self.length_slider))
         
+        all_lengths_check = ttk.Checkbutton(length_frame, text="All", variable=self.all_lengths)
+        all_lengths_check.pack(side=tk.LEFT, padx=(10, 0), anchor=tk.S)
+        
         
         # Row 4: Find Words Button (using tk.Button for color customization)
         self.find_button = tk.Button(main_frame, text="Find Words", command=self.find_words, 
                                    state="disabled", bg="lightgreen", fg="gray", 
                                    activebackground="darkgreen", activeforeground="white")
                                    
-        self.find_button.grid(row=4, column=0, columnspan=2, pady=(0, 10), sticky=tk.W)
+        self.find_button.grid(row=4, column=0, pady=(0, 10), sticky=tk.W)
         self.font_widgets.append(('tk_button', self.find_button))
         
+        action_frame = ttk.Frame(main_frame)
+        action_frame.grid(row=4, column=1, pady=(0, 10), sticky=tk.W)
+        
+        self.anagram_button = tk.Button(action_frame, text="Anagrams", command=self.find_anagrams,
+                                        state="disabled", bg="lightblue", activebackground="steelblue")
+        self.anagram_button.pack(side=tk.LEFT, padx=(0, 10))
+        self.font_widgets.append(('tk_button', self.anagram_button))
+        
+        self.cancel_button = tk.Button(action_frame, text="Cancel", command=self.cancel_task,
+                                       state="disabled", bg="lightgray", activebackground="gray")
+        self.cancel_button.pack(side=tk.LEFT, padx=(0, 10))
+        self.font_widgets.append(('tk_button', self.cancel_button))
+        
+        self.live_check = ttk.Checkbutton(action_frame, text="Live", variable=self.live_search_on)
+        self.live_check.pack(side=tk.LEFT)
+        
         # Row 5: Status Bar
         self.status_label = ttk.Label(main_frame, text="Load a word file to begin", 
                                      relief=tk.SUNKEN, anchor=tk.W)
@@ -97,26 +166,21 @@ class WordFinderApp:
         label6.grid(row=6, column=0, columnspan=2, sticky=tk.W)
         self.font_widgets.append(('label', label6))
         
-        # Row 7: Listbox with scrollbar
-        listbox_frame = ttk.Frame(main_frame)
-        listbox_frame.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
-        listbox_frame.columnconfigure(0, weight=1)
-        listbox_frame.rowconfigure(0, weight=1)
-        
-        self.results_listbox = tk.Listbox(listbox_frame, height=15)
-        self.results_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.results_listbox.bind('<Button-1>', self.on_word_click)
-        self.font_widgets.append(('listbox', self.results_listbox))
-        
-        scrollbar = ttk.Scrollbar(listbox_frame, orient="vertical", command=self.results_listbox.yview)
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.results_listbox.configure(yscrollcommand=scrollbar.set)
+        # Row 7: Listbox with scrollbar (only the visible rows are ever inserted)
+        self.results_view = VirtualListbox(main_frame, height=15)
+        self.results_view.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+        self.results_view.listbox.bind('<<ListboxSelect>>', self.on_word_click, add='+')
+        self.font_widgets.append(('virtual_listbox', self.results_view))
         
         # Row 8: Count Label
         self.count_label = ttk.Label(main_frame, text="0 words found")
         self.count_label.grid(row=8, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
         self.font_widgets.append(('label', self.count_label))
         
+        # Reload the word file whenever it is saved
+        watch_check = ttk.Checkbutton(main_frame, text="Watch file", variable=self.watch_file)
+        watch_check.grid(row=8, column=1, sticky=tk.E, pady=(0, 10))
+        
         # Row 9: Font Size Controls
         font_frame = ttk.Frame(main_frame)
         font_frame.grid(row=9, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
@@ -161,23 +225,193 @@ class WordFinderApp:
         """Load a word file"""
         file_path = filedialog.askopenfilename(
             title="Select Word File",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[("Text files", "*.txt"), ("Compiled word files", "*.wwd"),
+                       ("All files", "*.*")]
         )
         
         if file_path:
-            try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    self.words = [word.strip().lower() for word in file.readlines() if word.strip()]
-                
-                if not self.words:
-                    messagebox.showerror("Error", "The selected file is empty!")
-                    return
-                
-                self.status_label.config(text=f"Loaded {len(self.words)} words from file")
-                self.update_button_state()
+            self.status_label.config(text="Loading...")
+            self.run_task(self.load_solver, file_path, load=True,
+                          on_done=lambda solver: self.on_file_loaded(file_path, solver, "file"),
+                          on_progress=lambda done, total: self.show_progress("Loading", done, total),
+                          error_title="Failed to load file")
+            
+    def load_solver(self, file_path, progress):
+        """Worker side of loading: get the solver and build its anagram index"""
+        solver = self.solver_cache.get(file_path, progress)
+        solver.anagram_index()
+        self.solver_cache.recharge(file_path)
+        return solver
+        
+    def on_file_loaded(self, file_path, solver, source):
+        """Switch to a solver loaded by a worker thread"""
+        if not len(solver):
+            self.solver_cache.discard(file_path)
+            self.restore_dictionary_name()
+            messagebox.showerror("Error", "The selected file is empty!")
+            return
+        
+        self.register_dictionary(file_path)
+        self.solver = solver
+        self.solver_path = file_path
+        self.live_candidates = None
+        self.schedule_live_search()
+        self.status_label.config(text=f"Loaded {len(self.solver)} words from {source}")
+        self.update_button_state()
                 
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load file: {str(e)}")
+    def register_dictionary(self, file_path):
+        """Add a word file to the dictionary selector and select it"""
+        for name, path in self.dictionary_paths.items():
+            if path == file_path:
+                break
+        else:
+            name = os.path.basename(file_path)
+            if name in self.dictionary_paths:
+                name = f"{name} ({os.path.dirname(file_path)})"
+            self.dictionary_paths[name] = file_path
+            self.dictionary_combo.config(values=list(self.dictionary_paths))
+        self.dictionary_name.set(name)
+        
+    def restore_dictionary_name(self):
+        """Point the selector back at the dictionary actually in use, after a
+        load was cancelled or failed"""
+        for name, path in self.dictionary_paths.items():
+            if path == self.solver_path:
+                self.dictionary_name.set(name)
+                return
+        self.dictionary_name.set("")
+        
+    def select_dictionary(self, event=None):
+        """Switch to the dictionary picked in the selector"""
+        file_path = self.dictionary_paths[self.dictionary_name.get()]
+        source = "cache" if file_path in self.solver_cache else "file"
+        self.status_label.config(text="Loading...")
+        self.run_task(self.load_solver, file_path, load=True,
+                      on_done=lambda solver: self.on_file_loaded(file_path, solver, source),
+                      on_progress=lambda done, total: self.show_progress("Loading", done, total),
+                      error_title="Failed to load file")
+        
+    def watch_dictionary(self):
+        """Reload the selected word file in the background when it has changed
+        on disk; only the words that changed are re-indexed"""
+        self.root.after(WATCH_INTERVAL, self.watch_dictionary)
+        file_path = self.solver_path
+        # Don't interrupt a load or search, the next tick will catch the change
+        if not self.watch_file.get() or file_path is None or self.load_task or self.search_task:
+            return
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            return  # Being replaced right now
+        if mtime == self.solver_cache.mtime(file_path) or self.failed_reload == (file_path, mtime):
+            return
+        
+        self.status_label.config(text="Reloading...")
+        self.run_task(self.refresh_solver, file_path, load=True,
+                      on_done=lambda result: self.on_file_reloaded(file_path, *result),
+                      on_progress=lambda done, total: self.show_progress("Reloading", done, total),
+                      on_error=lambda e: self.on_reload_failed(file_path, mtime, e))
+        
+    def refresh_solver(self, file_path, progress):
+        """Worker side of a reload: returns (solver, changes)"""
+        solver, changes = self.solver_cache.refresh(file_path, progress)
+        solver.anagram_index()
+        self.solver_cache.recharge(file_path)
+        return solver, changes
+        
+    def on_file_reloaded(self, file_path, solver, changes):
+        """Switch to the updated solver, unless another dictionary was loaded
+        meanwhile. Searches already running keep the old one."""
+        if self.solver_path != file_path:
+            return
+        self.failed_reload = None
+        self.solver = solver
+        self.live_candidates = None
+        self.schedule_live_search()
+        if changes is None:
+            detail = "reloaded"
+        elif changes:
+            added = sum(len(words) for words, _ in changes.values())
+            removed = sum(len(words) for _, words in changes.values())
+            detail = f"{added} added, {removed} removed"
+        else:
+            detail = "no changes"
+        self.status_label.config(text=f"Reloaded {len(solver)} words ({detail})")
+        self.update_button_state()
+        
+    def on_reload_failed(self, file_path, mtime, error):
+        self.failed_reload = (file_path, mtime)
+        self.status_label.config(text=f"Reload failed, keeping the loaded words: {error}")
+        
+    def run_task(self, func, *args, on_done, on_progress=None, on_error=None, error_title="Error",
+                 load=False):
+        """Run func(*args, progress) on a worker thread. A search cancels the
+        previous search; a load (load=True) cancels the previous load and any
+        search, and blocks new searches until it ends. on_done(result),
+        on_progress(...) and on_error(exception) run on the main loop; without
+        on_error, errors are shown in a dialog."""
+        if self.search_task:
+            self.search_task.cancel()
+            self.search_task = None
+        task = BackgroundTask(lambda task, *args: func(*args, task.progress), *args)
+        if load:
+            if self.load_task:
+                self.load_task.cancel()
+            self.load_task = task
+        else:
+            self.search_task = task
+        task.start()
+        self.update_button_state()
+        self.root.after(POLL_INTERVAL, self.poll_task, task, on_done, on_progress, on_error,
+                        error_title)
+        
+    def is_current(self, task):
+        return task is self.load_task or task is self.search_task
+        
+    def poll_task(self, task, on_done, on_progress, on_error, error_title):
+        """Hand the worker's messages to the callbacks until the task ends"""
+        for kind, value in task.poll():
+            if not self.is_current(task):
+                return  # Cancelled or replaced by a newer task, drop its output
+            if kind == "progress":
+                if on_progress:
+                    on_progress(*value)
+                continue
+            
+            if task is self.load_task:
+                self.load_task = None
+                if kind != "done":
+                    self.restore_dictionary_name()
+            else:
+                self.search_task = None
+            self.update_button_state()
+            if kind == "done":
+                on_done(value)
+            elif kind == "error" and on_error:
+                on_error(value)
+            elif kind == "error":
+                messagebox.showerror("Error", f"{error_title}: {str(value)}")
+            return
+        
+        if self.is_current(task):
+            self.root.after(POLL_INTERVAL, self.poll_task, task, on_done, on_progress, on_error,
+                            error_title)
+            
+    def cancel_task(self):
+        """Cancel the running load and search"""
+        if self.load_task:
+            self.load_task.cancel()
+            self.load_task = None
+            self.restore_dictionary_name()
+        if self.search_task:
+            self.search_task.cancel()
+            self.search_task = None
+        self.update_button_state()
+        self.status_label.config(text="Cancelled")
+            
+    def show_progress(self, action, done, total):
+        percent = 100 * done // total if total else 100
+        self.status_label.config(text=f"{action}... {percent}%")
         
     def validate_mandatory_char(self, *args):
         """Validate mandatory character input"""
@@ -215,55 +449,131 @@ class WordFinderApp:
         self.update_button_state()
         
     def update_button_state(self):
-        """Enable/disable find button based on input validity"""
+        """Enable/disable find button based on input validity; searching is
+        off while a dictionary is loading"""
         mandatory = self.mandatory_char.get()
         additional = self.additional_chars.get()
-        has_words = len(self.words) > 0
+        has_words = len(self.solver) > 0
+        loading = self.load_task is not None
         
-        if len(mandatory) == 1 and len(additional) == 6 and has_words:
+        if len(mandatory) == 1 and len(additional) == 6 and has_words and not loading:
             self.find_button.config(state="normal")
+            self.anagram_button.config(state="normal")
         else:
             self.find_button.config(state="disabled")
+            self.anagram_button.config(state="disabled")
+        self.live_check.config(state="disabled" if loading else "normal")
+        busy = self.load_task is not None or self.search_task is not None
+        self.cancel_button.config(state="normal" if busy else "disabled")
             
     def update_length_label(self, *args):
         """Update the word length display label"""
         length = self.word_length.get()
         self.length_label.config(text=f"{length} characters")
         
+    def toggle_all_lengths(self, *args):
+        """The slider is ignored while every length is searched"""
+        self.length_slider.config(state="disabled" if self.all_lengths.get() else "normal")
+        self.schedule_live_search()
+        
+    def length_range(self):
+        """Every length the slider offers"""
+        return range(int(self.length_slider.cget('from')), int(self.length_slider.cget('to')) + 1)
+        
     def find_words(self):
         """Find words matching the criteria"""
         mandatory = self.mandatory_char.get().lower()
         additional = self.additional_chars.get().lower()
         target_length = self.word_length.get()
-        allowed_chars = set(mandatory + additional)
         
         # Clear previous results
-        self.results_listbox.delete(0, tk.END)
+        self.results_view.set_items([])
         self.status_label.config(text="Searching...")
         
-        matching_words = []
-        for word in self.words:
-            if len(word) != target_length:
-                continue
-            if mandatory not in word:
-                continue
-            if all(char in allowed_chars for char in word):
-                matching_words.append(word)
+        # Search on a worker thread against the solver as it is right now
+        solver = self.solver
+        if self.all_lengths.get():
+            lengths = self.length_range()
+            search = lambda progress: solver.solve_lengths(mandatory, additional, lengths, progress)
+            on_done = self.show_grouped_results
+        else:
+            search = lambda progress: list(solver.solve(mandatory, additional, target_length, progress))
+            on_done = self.show_results
+        self.run_task(search, on_done=on_done,
+                      on_progress=lambda done, total: self.show_progress("Searching", done, total),
+                      error_title="Search failed")
+        
+    def find_anagrams(self):
+        """Find every word that uses each of the 7 letters at most once"""
+        rack = self.mandatory_char.get().lower() + self.additional_chars.get().lower()
+        
+        self.results_view.set_items([])
+        self.status_label.config(text="Searching...")
+        
+        solver = self.solver
+        self.run_task(lambda progress: solver.sub_anagrams(rack),
+                      on_done=self.show_grouped_results,
+                      error_title="Search failed")
         
-        # Sort and display results
-        matching_words.sort()
-        for word in matching_words:
-            self.results_listbox.insert(tk.END, word)
+    def show_results(self, matching_words):
+        """Display search results (the solver yields them already sorted)"""
+        self.results_view.set_items(matching_words)
         
         count = len(matching_words)
         self.count_label.config(text=f"{count} words found")
         self.status_label.config(text=f"Search complete - {count} words found")
         
+    def show_grouped_results(self, groups):
+        """Display {length: [words]} results under one heading per length"""
+        items = []
+        for length, words in groups.items():
+            items.append(f"--- {length} letters ({len(words)}) ---")
+            items.extend(words)
+        self.results_view.set_items(items)
+        
+        count = sum(len(words) for words in groups.values())
+        self.count_label.config(text=f"{count} words found")
+        self.status_label.config(text=f"Search complete - {count} words found")
+        
+    def schedule_live_search(self, *args):
+        """Restart the debounce timer for live search"""
+        if self.live_after_id:
+            self.root.after_cancel(self.live_after_id)
+            self.live_after_id = None
+        if self.live_search_on.get():
+            self.live_after_id = self.root.after(LIVE_SEARCH_DELAY, self.live_search)
+            
+    def live_search(self):
+        """Search with whatever has been typed so far, filtering the previous
+        candidates when the query only got narrower"""
+        self.live_after_id = None
+        mandatory = self.mandatory_char.get().lower()
+        additional = self.additional_chars.get().lower()
+        if len(mandatory) != 1 or not len(self.solver) or self.load_task:
+            return  # on_file_loaded schedules a new live search once a load is done
+        
+        solver = self.solver
+        previous = self.live_candidates
+        self.status_label.config(text="Searching...")
+        self.run_task(lambda progress: solver.candidates(mandatory, additional, previous, progress),
+                      on_done=self.show_live_results,
+                      on_progress=lambda done, total: self.show_progress("Searching", done, total),
+                      error_title="Search failed")
+        
+    def show_live_results(self, candidates):
+        self.live_candidates = candidates
+        if self.all_lengths.get():
+            self.show_grouped_results(candidates.by_length(self.length_range()))
+        else:
+            self.show_results(candidates.of_length(self.word_length.get()))
+        
     def on_word_click(self, event):
         """Handle word selection in listbox"""
-        selection = self.results_listbox.curselection()
+        selection = self.results_view.curselection()
         if selection:
-            word = self.results_listbox.get(selection[0])
+            word = self.results_view.item(selection[0])
+            if word.startswith("---"):
+                return  # A length heading, not a word
             wiktionary_url = f"https://en.wiktionary.org/wiki/{word}"
             self.status_label.config(text=f"Click to view '{word}' on Wiktionary: {wiktionary_url}",
                                    foreground="blue", cursor="hand2")
@@ -298,6 +608,7 @@ class WordFinderApp:
         # Update TTK styles first
         self.style.configure('TLabel', font=default_font)
         self.style.configure('TButton', font=default_font)
+        self.style.configure('TCheckbutton', font=default_font)
         
         for widget_type, widget in self.font_widgets:
             try:
@@ -313,6 +624,8 @@ class WordFinderApp:
                     widget.configure(font=entry_font)
                 elif widget_type == 'listbox':
                     widget.configure(font=listbox_font)
+                elif widget_type == 'virtual_listbox':
+                    widget.set_font(listbox_font)
                 elif widget_type == 'scale':
                     widget.configure(font=default_font)
             except Exception as e: